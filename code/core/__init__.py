@@ -1,13 +1,33 @@
 from .game_states import GameState
+from .masks import MaskRegistry, masks
+from .assets import AssetManager, assets
+from .rng import SessionRandom, rng
+from .clock import Timer, GameClock, game_clock
+from .input import InputFrame, LiveInput, NullInput, ScriptedInput, InputManager, inputs
+from .replay import Replay, InputRecorder, ReplayInput
+from .governor import FrameGovernor, governor, SLOW_LOD_SCALE
+from .text import TextCache, DigitAtlas, text_cache
+from .shapes import Circle, Box, collide, first_hit, sector_hits
 from .settings import (
-    WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE,
+    WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, USE_SWARM,
+    SIM_RATE, FRAME_CAP, MENU_FRAME_CAP, PAUSE_DIM, VSYNC, MAX_FRAME_TIME, FRAME_BUDGET_MS, RECORD_REPLAY, REPLAY_PATH,
     DEFAULT_MUSIC_VOLUME, DEFAULT_SOUND_VOLUME,
     load_settings, save_settings
 )
 
 __all__ = [
     'GameState',
-    'WINDOW_WIDTH', 'WINDOW_HEIGHT', 'TILE_SIZE',
+    'WINDOW_WIDTH', 'WINDOW_HEIGHT', 'TILE_SIZE', 'USE_SWARM',
+    'SIM_RATE', 'FRAME_CAP', 'MENU_FRAME_CAP', 'PAUSE_DIM', 'VSYNC', 'MAX_FRAME_TIME', 'FRAME_BUDGET_MS', 'RECORD_REPLAY', 'REPLAY_PATH',
     'DEFAULT_MUSIC_VOLUME', 'DEFAULT_SOUND_VOLUME',
-    'load_settings', 'save_settings'
+    'load_settings', 'save_settings',
+    'MaskRegistry', 'masks',
+    'AssetManager', 'assets',
+    'Circle', 'Box', 'collide', 'first_hit', 'sector_hits',
+    'SessionRandom', 'rng',
+    'Timer', 'GameClock', 'game_clock',
+    'InputFrame', 'LiveInput', 'NullInput', 'ScriptedInput', 'InputManager', 'inputs',
+    'Replay', 'InputRecorder', 'ReplayInput',
+    'FrameGovernor', 'governor', 'SLOW_LOD_SCALE',
+    'TextCache', 'DigitAtlas', 'text_cache'
 ]
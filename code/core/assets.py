@@ -0,0 +1,63 @@
+import os
+
+import pygame
+
+
+class AssetManager:
+    """Единое хранилище изображений и звуков: каждый файл грузится один раз"""
+
+    def __init__(self):
+        self.images = {}
+        self.variants = {}
+        self.sounds = {}
+        self.folders = {}
+
+    def image(self, path, alpha=True):
+        key = (path, alpha)
+        surf = self.images.get(key)
+        if surf is None:
+            surf = pygame.image.load(path)
+            surf = surf.convert_alpha() if alpha else surf.convert()
+            self.images[key] = surf
+        return surf
+
+    def scaled(self, path, size, alpha=True):
+        """Изображение, масштабированное до size"""
+        key = (path, alpha, 'scale', tuple(size))
+        surf = self.variants.get(key)
+        if surf is None:
+            surf = pygame.transform.scale(self.image(path, alpha), size)
+            self.variants[key] = surf
+        return surf
+
+    def zoomed(self, path, zoom):
+        """Изображение, увеличенное в zoom раз (rotozoom без поворота)"""
+        key = (path, True, 'zoom', zoom)
+        surf = self.variants.get(key)
+        if surf is None:
+            surf = pygame.transform.rotozoom(self.image(path), 0, zoom)
+            self.variants[key] = surf
+        return surf
+
+    def frames(self, folder, key=None, extension=None):
+        """Кадры анимации из папки, отсортированные по имени файла (или по key)"""
+        cache_key = (folder, key, extension)
+        frames = self.folders.get(cache_key)
+        if frames is None:
+            file_names = [name for name in os.listdir(folder)
+                          if extension is None or name.endswith(extension)]
+            frames = [self.image(os.path.join(folder, name)) for name in sorted(file_names, key=key)]
+            self.folders[cache_key] = frames
+        return frames
+
+    def sound(self, path, volume=None):
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound
+
+
+assets = AssetManager()
@@ -0,0 +1,57 @@
+from heapq import heappush, heappop
+from itertools import count
+
+
+class Timer:
+    """Отложенный вызов на игровом времени; cancel() снимает его без поиска в очереди"""
+    __slots__ = ('due', 'callback', 'args', 'active')
+
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+
+
+class GameClock:
+    """Время симуляции в миллисекундах: идёт только шагами Game.update_world"""
+
+    def __init__(self):
+        self.time = 0.0
+        # Ускорение матча: больше фиксированных шагов за кадр, длина шага не меняется
+        self.time_scale = 1.0
+        # Куча (момент срабатывания, порядковый номер, таймер) - за шаг
+        # обрабатываются только наступившие таймеры
+        self.timers = []
+        self.timer_counter = count()
+
+    def reset(self):
+        self.time = 0.0
+        self.timers = []
+        self.timer_counter = count()
+
+    def schedule(self, delay, callback, *args):
+        """Вызывает callback(*args) через delay мс игрового времени"""
+        timer = Timer(self.time + delay, callback, args)
+        heappush(self.timers, (timer.due, next(self.timer_counter), timer))
+        return timer
+
+    def advance(self, dt):
+        self.time += dt * 1000
+        timers = self.timers
+        # Таймеры с равным сроком срабатывают в порядке постановки
+        while timers and timers[0][0] <= self.time:
+            timer = heappop(timers)[2]
+            if timer.active:
+                timer.active = False
+                timer.callback(*timer.args)
+
+    def ticks(self):
+        """Замена pygame.time.get_ticks() для игровой логики"""
+        return int(self.time)
+
+
+game_clock = GameClock()
@@ -0,0 +1,102 @@
+from collections import deque
+
+from .settings import FRAME_BUDGET_MS
+
+# Ступени снижения нагрузки: сначала необязательные эффекты, потом спавн
+GOVERNOR_LEVELS = (
+    'всё включено',
+    'без цифр урона',
+    'без следов попаданий, свечения и дуги меча',
+    'реже обновления за экраном',
+    'спавн 75%',
+    'спавн 50%',
+)
+SPAWN_SCALES = (1.0, 1.0, 1.0, 1.0, 0.75, 0.5)
+# Во сколько раз растягиваются интервалы обновления врагов за экраном с 3-й ступени
+SLOW_LOD_SCALE = 2
+
+# Решение принимается раз в CHECK_FRAMES кадров по перцентилю окна WINDOW кадров
+WINDOW = 120
+CHECK_FRAMES = 60
+PERCENTILE = 0.95
+# Нагрузка возвращается только после нескольких проверок подряд с запасом
+RECOVER_RATIO = 0.75
+RECOVER_CHECKS = 3
+
+
+class FrameGovernor:
+    """Следит за временем кадра и снижает необязательную нагрузку при превышении бюджета"""
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, verbose=False):
+        self.budget_ms = budget_ms
+        self.verbose = verbose      # печатать смену ступени в консоль
+        self.level_changes = 0      # сколько раз ступень менялась за матч
+        self.frame_times = deque(maxlen=WINDOW)
+        self.level = 0
+        self.frames_since_check = 0
+        self.healthy_checks = 0
+        self.last_percentile = 0.0
+
+    # Решения, которые читают остальные модули
+    @property
+    def damage_text(self):
+        return self.level < 1
+
+    @property
+    def extra_effects(self):
+        return self.level < 2
+
+    @property
+    def lod_scale(self):
+        return SLOW_LOD_SCALE if self.level >= 3 else 1
+
+    @property
+    def spawn_scale(self):
+        return SPAWN_SCALES[self.level]
+
+    def describe(self):
+        return GOVERNOR_LEVELS[self.level]
+
+    def report(self):
+        """Итог матча для консоли в подробном режиме"""
+        if self.verbose:
+            print(f"Нагрузка за матч: смен уровня {self.level_changes}, итоговый уровень {self.level} - {self.describe()}")
+
+    def reset(self):
+        self.level = 0
+        self.level_changes = 0
+        self.frame_times.clear()
+        self.frames_since_check = 0
+        self.healthy_checks = 0
+
+    def set_level(self, level):
+        level = max(0, min(len(GOVERNOR_LEVELS) - 1, level))
+        if level != self.level:
+            self.level = level
+            self.level_changes += 1
+            if self.verbose:
+                print(f"Нагрузка: уровень {level} - {self.describe()} (p95 {self.last_percentile:.1f} мс)")
+
+    def record(self, frame_ms):
+        """Время работы одного кадра без ожидания ограничителя FPS"""
+        self.frame_times.append(frame_ms)
+        self.frames_since_check += 1
+        if self.frames_since_check < CHECK_FRAMES or len(self.frame_times) < WINDOW:
+            return
+        self.frames_since_check = 0
+
+        ordered = sorted(self.frame_times)
+        self.last_percentile = ordered[int(PERCENTILE * (len(ordered) - 1))]
+        if self.last_percentile > self.budget_ms:
+            self.healthy_checks = 0
+            self.set_level(self.level + 1)
+        elif self.last_percentile < self.budget_ms * RECOVER_RATIO and self.level > 0:
+            self.healthy_checks += 1
+            if self.healthy_checks >= RECOVER_CHECKS:
+                self.healthy_checks = 0
+                self.set_level(self.level - 1)
+        else:
+            self.healthy_checks = 0
+
+
+governor = FrameGovernor()
@@ -0,0 +1,68 @@
+import pygame
+
+from .settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# Клавиши, которые читает игровая логика (остальные в кадр ввода не попадают)
+GAME_KEYS = (
+    pygame.K_RIGHT, pygame.K_LEFT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_d, pygame.K_a, pygame.K_w, pygame.K_s,
+    pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_q,
+)
+SCREEN_CENTER = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+
+
+class InputFrame:
+    """Состояние ввода на один шаг симуляции"""
+    __slots__ = ('keys', 'mouse_pos', 'mouse_buttons')
+
+    def __init__(self, keys=(), mouse_pos=SCREEN_CENTER, mouse_buttons=(False, False, False)):
+        self.keys = frozenset(keys)
+        self.mouse_pos = tuple(mouse_pos)
+        self.mouse_buttons = tuple(mouse_buttons)
+
+    def pressed(self, key):
+        return key in self.keys
+
+
+EMPTY_FRAME = InputFrame()
+
+
+class LiveInput:
+    """Живой ввод с клавиатуры и мыши"""
+
+    def poll(self):
+        keys = pygame.key.get_pressed()
+        return InputFrame([key for key in GAME_KEYS if keys[key]],
+                          pygame.mouse.get_pos(), pygame.mouse.get_pressed())
+
+
+class NullInput:
+    """Ничего не нажато - для безоконных прогонов"""
+
+    def poll(self):
+        return EMPTY_FRAME
+
+
+class ScriptedInput:
+    """Кадры ввода из заранее заданной последовательности; после её конца - пустой ввод"""
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    def poll(self):
+        return next(self.frames, EMPTY_FRAME)
+
+
+class InputManager:
+    """Источник ввода для игровой логики; опрашивается один раз за шаг симуляции"""
+
+    def __init__(self, source=None):
+        self.source = source or LiveInput()
+        self.frame = EMPTY_FRAME
+
+    def poll(self):
+        self.frame = self.source.poll()
+        return self.frame
+
+
+inputs = InputManager()
@@ -0,0 +1,39 @@
+import weakref
+
+import pygame
+
+
+class MaskRegistry:
+    """Общие маски коллизий: одна на кадр и одна круглая на размер врага"""
+
+    def __init__(self):
+        self.frame_masks = weakref.WeakKeyDictionary()
+        self.circle_masks = {}
+
+    def prepare(self, frames):
+        """Заранее строит маски для всех кадров анимации"""
+        for frame in frames:
+            self.from_surface(frame)
+
+    def from_surface(self, surface):
+        mask = self.frame_masks.get(surface)
+        if mask is None:
+            mask = pygame.mask.from_surface(surface)
+            self.frame_masks[surface] = mask
+        return mask
+
+    def circle(self, size):
+        """Круглая маска, вписанная в прямоугольник размера size"""
+        width, height = int(size[0]), int(size[1])
+        mask = self.circle_masks.get((width, height))
+        if mask is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (255, 255, 255, 255),
+                               (width // 2, height // 2),
+                               min(width, height) // 2)
+            mask = pygame.mask.from_surface(surface)
+            self.circle_masks[(width, height)] = mask
+        return mask
+
+
+masks = MaskRegistry()
@@ -0,0 +1,100 @@
+import os
+import struct
+import zlib
+
+from .input import GAME_KEYS, InputFrame
+from .governor import governor
+
+REPLAY_MAGIC = b'BSRP'
+REPLAY_VERSION = 2
+# Заголовок: метка, версия, зерно, частота симуляции, карта, сложность, рой
+HEADER = struct.Struct('<4sHIHBBB')
+# Кадр ввода: клавиши битовой маской по GAME_KEYS, позиция мыши, кнопки мыши битовой маской
+# и уровень FrameGovernor (он влияет на спавн и обновления за экраном)
+FRAME = struct.Struct('<HhhBB')
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(GAME_KEYS)}
+
+
+def pack_frame(frame, level=0):
+    keys = 0
+    for key in frame.keys:
+        keys |= KEY_BITS.get(key, 0)
+    buttons = 0
+    for bit, pressed in enumerate(frame.mouse_buttons[:3]):
+        if pressed:
+            buttons |= 1 << bit
+    x, y = frame.mouse_pos
+    return FRAME.pack(keys, int(x), int(y), buttons, level)
+
+
+def unpack_frame(data, offset=0):
+    """(кадр ввода, уровень нагрузки)"""
+    keys, x, y, buttons, level = FRAME.unpack_from(data, offset)
+    frame = InputFrame([key for key, bit in KEY_BITS.items() if keys & bit], (x, y),
+                       [bool(buttons & (1 << bit)) for bit in range(3)])
+    return frame, level
+
+
+class Replay:
+    """Запись матча: параметры сессии и кадры ввода по одному на шаг симуляции"""
+
+    def __init__(self, seed, map_index, difficulty, use_swarm, sim_rate, data=None):
+        self.seed = seed
+        self.map_index = map_index
+        self.difficulty = difficulty
+        self.use_swarm = use_swarm
+        self.sim_rate = sim_rate
+        self.data = bytearray(data or b'')
+
+    @property
+    def frame_count(self):
+        return len(self.data) // FRAME.size
+
+    def append(self, frame, level=0):
+        self.data += pack_frame(frame, level)
+
+    def frames(self):
+        for offset in range(0, len(self.data), FRAME.size):
+            yield unpack_frame(self.data, offset)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.sim_rate,
+                             self.map_index, self.difficulty, int(self.use_swarm))
+        with open(path, 'wb') as f:
+            f.write(header + zlib.compress(bytes(self.data), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        magic, version, seed, sim_rate, map_index, difficulty, use_swarm = HEADER.unpack_from(raw)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"Неподдерживаемый файл реплея: {path}")
+        return cls(seed, map_index, difficulty, bool(use_swarm), sim_rate,
+                   zlib.decompress(raw[HEADER.size:]))
+
+
+class InputRecorder:
+    """Источник ввода, который записывает каждый опрошенный кадр в реплей"""
+
+    def __init__(self, source, replay):
+        self.source = source
+        self.replay = replay
+
+    def poll(self):
+        frame = self.source.poll()
+        self.replay.append(frame, governor.level)
+        return frame
+
+
+class ReplayInput:
+    """Ввод из реплея; заодно восстанавливает записанный уровень нагрузки"""
+
+    def __init__(self, replay):
+        self.frames = replay.frames()
+
+    def poll(self):
+        frame, level = next(self.frames, (None, 0))
+        governor.level = level
+        return frame or InputFrame()
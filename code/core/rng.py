@@ -0,0 +1,21 @@
+import random
+
+
+class SessionRandom(random.Random):
+    """Общий генератор случайных чисел сессии: одно зерно - одна и та же игра"""
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self.session_seed = None
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Новое зерно сессии; без аргумента берётся случайное и запоминается для реплея"""
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.session_seed = seed
+        self.seed(seed)
+        return seed
+
+
+rng = SessionRandom()
@@ -6,6 +6,22 @@ from os.path import join
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280,720 
 TILE_SIZE = 64
 
+# Игровой цикл: симуляция идёт фиксированными шагами, отрисовка - с ограничением FPS
+SIM_RATE = 60          # шагов симуляции в секунду
+FRAME_CAP = 144        # максимум кадров в секунду (0 - без ограничения)
+MENU_FRAME_CAP = 30    # меню перерисовывает только изменения, ему хватает и этого
+PAUSE_DIM = 140        # затемнение застывшего кадра под меню паузы (0 - без затемнения)
+VSYNC = False          # вертикальная синхронизация (если поддерживается драйвером)
+MAX_FRAME_TIME = 0.25  # после долгого кадра догоняем не больше этого времени
+FRAME_BUDGET_MS = 1000 / 60  # бюджет кадра для FrameGovernor
+
+# Запись ввода последнего матча для воспроизведения без окна (python main.py --replay ...)
+RECORD_REPLAY = True
+REPLAY_PATH = join(os.path.dirname(os.path.dirname(__file__)), 'data', 'replays', 'last.replay')
+
+# Роевой движок для обычных врагов (NumPy); босс всегда остаётся отдельным объектом
+USE_SWARM = False
+
 # Настройки звука по умолчанию
 DEFAULT_MUSIC_VOLUME = 0.5
 DEFAULT_SOUND_VOLUME = 0.5
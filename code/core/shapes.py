@@ -0,0 +1,109 @@
+import math
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен - без него работает обычный цикл
+    np = None
+
+# С какого числа кандидатов проверка пачкой через NumPy выгоднее цикла
+BATCH_THRESHOLD = 16
+
+
+class Circle:
+    """Круглая форма; центр задаётся смещением от rect.topleft владельца"""
+
+    def __init__(self, radius, center):
+        self.radius = radius
+        self.center = center
+
+    @classmethod
+    def inscribed(cls, size):
+        """Круг, вписанный в прямоугольник (как прежняя круглая маска врага)"""
+        width, height = int(size[0]), int(size[1])
+        return cls(min(width, height) // 2, (width // 2, height // 2))
+
+    def world_center(self, sprite):
+        return sprite.rect.x + self.center[0], sprite.rect.y + self.center[1]
+
+
+class Box:
+    """Прямоугольная форма: используется rect-атрибут владельца (rect или hitbox_rect)"""
+
+    def __init__(self, attr='rect'):
+        self.attr = attr
+
+    def world_rect(self, sprite):
+        return getattr(sprite, self.attr)
+
+
+def circle_hits_rect(x, y, radius, rect):
+    nearest_x = min(max(x, rect.left), rect.right)
+    nearest_y = min(max(y, rect.top), rect.bottom)
+    return (x - nearest_x) ** 2 + (y - nearest_y) ** 2 <= radius * radius
+
+
+def collide(a, b):
+    """Проверка попадания по формам спрайтов; маски - только если формы не заданы"""
+    shape_a = getattr(a, 'shape', None)
+    shape_b = getattr(b, 'shape', None)
+
+    if isinstance(shape_a, Circle) and isinstance(shape_b, Circle):
+        ax, ay = shape_a.world_center(a)
+        bx, by = shape_b.world_center(b)
+        reach = shape_a.radius + shape_b.radius
+        return (ax - bx) ** 2 + (ay - by) ** 2 <= reach * reach
+
+    if isinstance(shape_a, Box) and isinstance(shape_b, Box):
+        return shape_a.world_rect(a).colliderect(shape_b.world_rect(b))
+
+    if isinstance(shape_a, Circle) and isinstance(shape_b, Box):
+        return circle_hits_rect(*shape_a.world_center(a), shape_a.radius, shape_b.world_rect(b))
+
+    if isinstance(shape_a, Box) and isinstance(shape_b, Circle):
+        return circle_hits_rect(*shape_b.world_center(b), shape_b.radius, shape_a.world_rect(a))
+
+    # Формы, которым нужна попиксельная точность
+    return bool(pygame.sprite.collide_mask(a, b))
+
+
+def first_hit(sprite, targets):
+    """Первая цель (в порядке списка), в которую попадает sprite"""
+    shape = getattr(sprite, 'shape', None)
+    if (np is not None and len(targets) >= BATCH_THRESHOLD and isinstance(shape, Circle)
+            and all(isinstance(getattr(target, 'shape', None), Circle) for target in targets)):
+        # Один круг против многих кругов за одну векторную операцию
+        x, y = shape.world_center(sprite)
+        centers = np.array([target.shape.world_center(target) for target in targets], dtype=float)
+        radii = np.array([target.shape.radius for target in targets], dtype=float) + shape.radius
+        hits = np.nonzero((centers[:, 0] - x) ** 2 + (centers[:, 1] - y) ** 2 <= radii * radii)[0]
+        return targets[hits[0]] if len(hits) else None
+
+    for target in targets:
+        if collide(sprite, target):
+            return target
+    return None
+
+
+def sector_hits(origin, direction, reach, half_angle, sprite):
+    """Попадание сектора (удар мечом) по форме спрайта"""
+    shape = getattr(sprite, 'shape', None)
+    if isinstance(shape, Circle):
+        x, y = shape.world_center(sprite)
+        radius = shape.radius
+    else:
+        x, y = sprite.rect.center
+        radius = 0
+
+    dx, dy = x - origin[0], y - origin[1]
+    distance = math.hypot(dx, dy)
+    if distance - radius > reach:
+        return False
+    if distance <= radius:
+        return True
+
+    # Угол до центра с допуском на радиус цели
+    angle = abs(direction.angle_to(pygame.Vector2(dx, dy)))
+    angle = min(angle, 360 - angle)
+    return angle <= half_angle + math.degrees(math.asin(radius / distance))
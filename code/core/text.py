@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+import pygame
+
+# Сколько отрисованных строк держать в кэше
+TEXT_CACHE_SIZE = 256
+# Символы, которые атлас готовит сразу - цифры урона
+DIGIT_GLYPHS = '-+0123456789'
+
+
+class DigitAtlas:
+    """Заранее отрисованные символы одного шрифта и цвета - число собирается из готовых глифов"""
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+        for char in DIGIT_GLYPHS:
+            self.glyph(char)
+
+    def glyph(self, char):
+        surf = self.glyphs.get(char)
+        if surf is None:
+            surf = self.font.render(char, True, self.color)
+            self.glyphs[char] = surf
+        return surf
+
+    def width(self, text):
+        return sum(self.glyph(char).get_width() for char in text)
+
+    def layout(self, text, pos):
+        """Пары (глиф, позиция) для blits - можно собрать несколько строк в один вызов"""
+        x, y = pos
+        sequence = []
+        for char in text:
+            glyph = self.glyph(char)
+            sequence.append((glyph, (x, y)))
+            x += glyph.get_width()
+        return sequence
+
+    def draw(self, surface, text, pos):
+        """Рисует text с левым верхним углом в pos одним вызовом blits"""
+        surface.blits(self.layout(text, pos), False)
+
+
+class TextCache:
+    """Общие шрифты и LRU отрисованных строк: неизменный текст не рендерится повторно"""
+
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.atlases = {}
+
+    def font(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None):
+        key = (name, size, text, color)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.font(size, name).render(text, True, color)
+            self.surfaces[key] = surf
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surf
+
+    def digits(self, size, color, name=None):
+        """Атлас цифр для часто меняющихся чисел (урон)"""
+        key = (name, size, color)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = DigitAtlas(self.font(size, name), color)
+            self.atlases[key] = atlas
+        return atlas
+
+
+text_cache = TextCache()
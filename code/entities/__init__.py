@@ -6,5 +6,9 @@ from .player import Player
 from .enemy import Enemy
 from .enemies import Bat, Slime, Skeleton
 from .boss import Boss
+from .swarm import Swarm
+from .lod import LODScheduler
+from .director import SpawnDirector
+from .overlay import WorldOverlay
 
-__all__ = ['Player', 'Enemy', 'Bat', 'Slime', 'Skeleton', 'Boss'] 
\ No newline at end of file
+__all__ = ['Player', 'Enemy', 'Bat', 'Slime', 'Skeleton', 'Boss', 'Swarm', 'LODScheduler', 'SpawnDirector', 'WorldOverlay'] 
\ No newline at end of file
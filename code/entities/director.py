@@ -0,0 +1,112 @@
+from collections import deque
+from itertools import accumulate
+
+import pygame
+
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, rng, governor
+from sprites import SpatialGrid
+
+# Стоимость врага в очках бюджета волны
+ARCHETYPE_COSTS = {'bat': 1, 'blob': 2, 'skeleton': 3}
+DEFAULT_COST = 2
+
+# Веса выбора типа врага по сложностям (0-Легко, 1-Средне, 2-Сложно)
+ARCHETYPE_WEIGHTS = {
+    0: {'bat': 4, 'blob': 2, 'skeleton': 1},
+    1: {'bat': 3, 'blob': 3, 'skeleton': 2},
+    2: {'bat': 2, 'blob': 3, 'skeleton': 4},
+}
+
+# Максимум живых обычных врагов одновременно
+MAX_POPULATION = {0: 60, 1: 90, 2: 120}
+
+# Волны: раз в WAVE_INTERVAL мс бюджет растёт на WAVE_GROWTH до WAVE_MAX_BUDGET
+# (всё умножается на spawn_rate сложности)
+WAVE_INTERVAL = 3000
+WAVE_BASE_BUDGET = 16
+WAVE_GROWTH = 2
+WAVE_MAX_BUDGET = 60
+
+# Враги появляются за краем экрана, но не дальше пары экранов от игрока
+SPAWN_EXCLUSION_MARGIN = TILE_SIZE
+SPAWN_SEARCH_MARGIN = WINDOW_WIDTH
+
+
+def build_spawn_table(archetypes, difficulty):
+    """Имена врагов и накопленные веса для выбранной сложности"""
+    weights = ARCHETYPE_WEIGHTS.get(difficulty, ARCHETYPE_WEIGHTS[1])
+    names = [name for name in archetypes if weights.get(name, 1) > 0]
+    return names, list(accumulate(weights.get(name, 1) for name in names))
+
+
+class SpawnDirector:
+    """Волны обычных врагов с бюджетом очков и ограничением численности"""
+
+    def __init__(self, spawn_points, archetypes, difficulty, spawn_rate=1.0, max_population=None):
+        self.difficulty = difficulty
+        self.spawn_rate = spawn_rate  # множитель бюджета волны
+        self.max_population = max_population or MAX_POPULATION.get(difficulty, MAX_POPULATION[1])
+        self.names, self.cum_weights = build_spawn_table(archetypes, difficulty)
+        self.costs = {name: ARCHETYPE_COSTS.get(name, DEFAULT_COST) for name in self.names}
+        self.cheapest = min(self.names, key=self.costs.__getitem__) if self.names else None
+
+        # Точки спавна в сетке - проверка относительно игрока одним запросом
+        self.spawn_points = list(dict.fromkeys(spawn_points))
+        self.grid = SpatialGrid(TILE_SIZE * 4)
+        for point in self.spawn_points:
+            self.grid.insert(point, pygame.FRect(point, (1, 1)))
+        self.exclusion_rect = pygame.FRect(0, 0, WINDOW_WIDTH + SPAWN_EXCLUSION_MARGIN * 2,
+                                           WINDOW_HEIGHT + SPAWN_EXCLUSION_MARGIN * 2)
+        self.search_rect = pygame.FRect(0, 0, WINDOW_WIDTH + SPAWN_SEARCH_MARGIN * 2,
+                                        WINDOW_HEIGHT + SPAWN_SEARCH_MARGIN * 2)
+
+        self.time = 0
+        self.wave = 0
+        self.next_wave_time = 0
+        self.queue = deque()  # (время появления, тип врага)
+
+    def plan_wave(self):
+        """Раскладывает бюджет волны на врагов и равномерно распределяет их по интервалу"""
+        budget = min(WAVE_BASE_BUDGET + WAVE_GROWTH * self.wave, WAVE_MAX_BUDGET) * self.spawn_rate
+        # Последняя ступень FrameGovernor - урезанный спавн
+        budget *= governor.spawn_scale
+        self.wave += 1
+        planned = []
+        while self.cheapest and budget >= self.costs[self.cheapest]:
+            name = rng.choices(self.names, cum_weights=self.cum_weights)[0]
+            if self.costs[name] > budget:
+                name = self.cheapest
+            budget -= self.costs[name]
+            planned.append(name)
+
+        if planned:
+            step = WAVE_INTERVAL / len(planned)
+            for i, name in enumerate(planned):
+                self.queue.append((self.time + i * step, name))
+
+    def pick_spawn_point(self, player_pos):
+        """Точка за экраном рядом с игроком; если таких нет - любая за экраном"""
+        self.exclusion_rect.center = player_pos
+        self.search_rect.center = player_pos
+        exclusion = self.exclusion_rect
+        candidates = [point for point in self.grid.query(self.search_rect) if not exclusion.collidepoint(point)]
+        if not candidates:
+            candidates = [point for point in self.spawn_points if not exclusion.collidepoint(point)]
+        return rng.choice(candidates) if candidates else None
+
+    def update(self, dt, player_pos, population):
+        """Враги, которых нужно создать на этом шаге: список (тип, позиция)"""
+        self.time += dt * 1000
+        # Новая волна планируется только после того, как вышла предыдущая
+        if not self.queue and self.time >= self.next_wave_time:
+            self.next_wave_time = self.time + WAVE_INTERVAL
+            self.plan_wave()
+
+        spawns = []
+        while self.queue and self.queue[0][0] <= self.time and population < self.max_population:
+            pos = self.pick_spawn_point(player_pos)
+            if pos is None:
+                break
+            spawns.append((self.queue.popleft()[1], pos))
+            population += 1
+        return spawns
@@ -0,0 +1,51 @@
+import weakref
+
+import pygame
+
+# Ступени затухания вспышки при попадании
+FLASH_LEVELS = 6
+FLASH_BRIGHTNESS = 100
+
+
+class FlashCache:
+    """Кэш затемнённых и осветлённых кадров для эффекта попадания"""
+
+    def __init__(self, levels=FLASH_LEVELS, brightness=FLASH_BRIGHTNESS):
+        self.levels = levels
+        self.brightness = brightness
+        # Ключ - исходный кадр; кадры одного типа врага общие, поэтому кэш по сути на архетип
+        self.dark_frames = weakref.WeakKeyDictionary()
+        self.bright_frames = weakref.WeakKeyDictionary()
+
+    def prepare(self, frames):
+        """Заранее строит все варианты для кадров анимации"""
+        for frame in frames:
+            self.darkened(frame)
+            self.brightened(frame, 0)
+
+    def darkened(self, frame):
+        dark = self.dark_frames.get(frame)
+        if dark is None:
+            dark = frame.copy()
+            # Вычитаем яркость только из RGB, альфа остаётся как у исходного кадра
+            value = self.brightness
+            dark.fill((value, value, value, 0), special_flags=pygame.BLEND_RGB_SUB)
+            self.dark_frames[frame] = dark
+        return dark
+
+    def brightened(self, frame, progress):
+        """Осветлённый кадр для прогресса вспышки от 0 до 1"""
+        levels = self.bright_frames.get(frame)
+        if levels is None:
+            levels = []
+            for level in range(self.levels):
+                value = int(self.brightness * (self.levels - level) / self.levels)
+                bright = frame.copy()
+                bright.fill((value, value, value, 0), special_flags=pygame.BLEND_RGB_ADD)
+                levels.append(bright)
+            self.bright_frames[frame] = levels
+        level = min(self.levels - 1, max(0, int(progress * self.levels)))
+        return levels[level]
+
+
+flash_cache = FlashCache()
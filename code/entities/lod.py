@@ -0,0 +1,62 @@
+from itertools import count
+
+import pygame
+
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, SIM_RATE, governor, SLOW_LOD_SCALE
+
+# Уровни детализации врагов по расстоянию до камеры
+LOD_VISIBLE, LOD_NEAR, LOD_FAR = range(3)
+
+# Запас вокруг экрана, в котором враг ещё считается видимым (чтобы не дёргался на краю)
+VISIBLE_MARGIN = TILE_SIZE * 2
+# Ближняя зона за экраном; дальше неё пули уже не долетают
+NEAR_MARGIN = WINDOW_WIDTH // 2
+# Ближние враги обновляются раз в NEAR_INTERVAL шагов, дальние - по очереди в FAR_SLICES срезах
+NEAR_INTERVAL = 2
+FAR_SLICES = 4
+# Накопленный шаг не больше самого длинного интервала (дальний срез при растянутых интервалах);
+# остаток сверх него не теряется, а переносится на следующее обновление
+MAX_LOD_DT = FAR_SLICES * SLOW_LOD_SCALE / SIM_RATE
+
+
+class LODScheduler:
+    """Решает, на каком шаге и с каким dt обновлять врага"""
+
+    def __init__(self):
+        self.tick = 0
+        self.slots = count()
+        self.visible_rect = pygame.FRect(0, 0, WINDOW_WIDTH + VISIBLE_MARGIN * 2, WINDOW_HEIGHT + VISIBLE_MARGIN * 2)
+        self.near_rect = pygame.FRect(0, 0, WINDOW_WIDTH + NEAR_MARGIN * 2, WINDOW_HEIGHT + NEAR_MARGIN * 2)
+
+    def begin_step(self, camera_center):
+        self.tick += 1
+        self.visible_rect.center = camera_center
+        self.near_rect.center = camera_center
+
+    def classify(self, rect):
+        if self.visible_rect.colliderect(rect):
+            return LOD_VISIBLE
+        if self.near_rect.colliderect(rect):
+            return LOD_NEAR
+        return LOD_FAR
+
+    def schedule(self, enemy, dt):
+        """(dt для обновления или 0, если враг пропускает этот шаг; уровень детализации)"""
+        level = self.classify(enemy.rect)
+        if level == LOD_VISIBLE:
+            enemy.lod_dt += dt
+            dt = min(enemy.lod_dt, MAX_LOD_DT)
+            enemy.lod_dt -= dt
+            return dt, level
+
+        # Срез врага назначается при первом появлении за экраном
+        if enemy.lod_slot is None:
+            enemy.lod_slot = next(self.slots)
+        enemy.lod_dt += dt
+        # При нехватке времени кадра интервалы растягиваются
+        interval = (NEAR_INTERVAL if level == LOD_NEAR else FAR_SLICES) * governor.lod_scale
+        if (self.tick + enemy.lod_slot) % interval:
+            return 0, level
+        dt = min(enemy.lod_dt, MAX_LOD_DT)
+        enemy.lod_dt -= dt
+        return dt, level
@@ -0,0 +1,113 @@
+import pygame
+
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, game_clock, governor, text_cache
+
+# Цвета полоски здоровья
+BAR_BACK_COLOR = (255, 0, 0)
+BAR_FILL_COLOR = (0, 255, 0)
+BAR_BORDER_COLOR = (255, 215, 0)
+HIT_LINE_COLOR = (255, 50, 50)
+DAMAGE_COLOR = (220, 20, 60)
+DAMAGE_SHADOW_COLOR = (0, 0, 0)
+DAMAGE_FONT_SIZE = 24
+
+
+class WorldOverlay:
+    """Полоски здоровья, цифры урона и следы попаданий поверх мира - одним проходом по видимым врагам"""
+
+    def __init__(self):
+        # Готовые кадры полоски: (ширина, высота) -> {заполнение в пикселях: поверхность с рамкой}
+        self.bar_frames = {}
+        # Следы попаданий: геометрия палочек -> (поверхность, смещение от rect.topleft)
+        self.hit_markers = {}
+        self.view_rect = pygame.FRect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    def bar_frame(self, width, height, filled):
+        """Полоска с рамкой размером (width + 2, height + 2) - рисуется один раз на заполнение"""
+        frames = self.bar_frames.setdefault((width, height), {})
+        frame = frames.get(filled)
+        if frame is None:
+            frame = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+            pygame.draw.rect(frame, BAR_BACK_COLOR, (1, 1, width, height))
+            if filled > 0:
+                pygame.draw.rect(frame, BAR_FILL_COLOR, (1, 1, filled, height))
+            pygame.draw.rect(frame, BAR_BORDER_COLOR, frame.get_rect(), 2)
+            frames[filled] = frame
+        return frame
+
+    def hit_marker(self, lines):
+        """Палочки попадания в одной поверхности"""
+        key = tuple(lines)
+        marker = self.hit_markers.get(key)
+        if marker is None:
+            xs = [point[0] for line in lines for point in line]
+            ys = [point[1] for line in lines for point in line]
+            left, top = int(min(xs)) - 2, int(min(ys)) - 2
+            surf = pygame.Surface((int(max(xs)) - left + 3, int(max(ys)) - top + 3), pygame.SRCALPHA)
+            for start, end in lines:
+                pygame.draw.line(surf, HIT_LINE_COLOR, (start[0] - left, start[1] - top),
+                                 (end[0] - left, end[1] - top), 3)
+            marker = (surf, (left, top))
+            self.hit_markers[key] = marker
+        return marker
+
+    def add_bar(self, bars, texts, centerx, top, width, height, health_ratio, damage):
+        """Добавляет полоску (и цифру урона) в пакет, если она попадает на экран"""
+        x = int(centerx) - width // 2
+        y = int(top)
+        if x + width + 1 < 0 or x - 1 > WINDOW_WIDTH or y + height + 1 < 0 or y - 1 > WINDOW_HEIGHT:
+            return
+        filled = max(0, min(width, int(width * health_ratio)))
+        bars.append((self.bar_frame(width, height, filled), (x - 1, y - 1)))
+        if damage is not None:
+            texts.append((f"-{damage}", x + width // 2, y - 20))
+
+    def draw(self, surface, all_sprites, swarm=None, alpha=1.0):
+        offset = all_sprites.offset
+        ox, oy = int(offset.x), int(offset.y)
+        self.view_rect.topleft = (-offset.x, -offset.y)
+        current_time = game_clock.ticks()
+        bars = []
+        markers = []
+        texts = []
+
+        # Только спрайты, попавшие в камеру на этом кадре
+        for sprite in all_sprites.visible:
+            width = getattr(sprite, 'hp_bar_width', None)
+            if width is None or sprite.death_time:
+                continue
+            rect = sprite.rect
+            # Та же промежуточная позиция, что и у спрайта в AllSprites.draw
+            previous = all_sprites.previous.get(sprite)
+            if previous is None:
+                x, y = rect.x, rect.y
+            else:
+                x = previous[0] + (rect.x - previous[0]) * alpha
+                y = previous[1] + (rect.y - previous[1]) * alpha
+            hit = (hasattr(sprite, 'hit_effect_time') and
+                   current_time - sprite.hit_effect_time < sprite.hit_effect_duration)
+            damage = sprite.hit_damage if hit and governor.damage_text else None
+            self.add_bar(bars, texts, x + rect.width / 2 + ox, y - 15 + oy,
+                         width, sprite.hp_bar_height, sprite.health / sprite.max_health, damage)
+            if hit and governor.extra_effects and hasattr(sprite, 'hit_lines'):
+                marker, (dx, dy) = self.hit_marker(sprite.hit_lines)
+                markers.append((marker, (int(x) + dx + ox, int(y) + dy + oy)))
+
+        if swarm:
+            for centerx, top, health_ratio, damage in swarm.hp_bar_entries(self.view_rect, current_time, alpha):
+                self.add_bar(bars, texts, centerx + ox, top + oy, swarm.hp_bar_width, swarm.hp_bar_height,
+                             health_ratio, damage if governor.damage_text else None)
+
+        # Урон собирается из готовых глифов: сначала все тени, потом все цифры
+        shadow_glyphs = []
+        digit_glyphs = []
+        if texts:
+            digits = text_cache.digits(DAMAGE_FONT_SIZE, DAMAGE_COLOR)
+            shadows = text_cache.digits(DAMAGE_FONT_SIZE, DAMAGE_SHADOW_COLOR)
+            for text, centerx, y in texts:
+                x = centerx - digits.width(text) // 2
+                shadow_glyphs.extend(shadows.layout(text, (x + 1, y + 1)))
+                digit_glyphs.extend(digits.layout(text, (x, y)))
+
+        # Весь слой - один вызов blits
+        surface.blits(bars + shadow_glyphs + digit_glyphs + markers, False)
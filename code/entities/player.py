@@ -1,8 +1,8 @@
 import pygame
 import os
 
-from weapons import Pistol, Shotgun, Sword, AutoRifle, GunSprite, Bullet, WeaponItem
-from core import WINDOW_WIDTH, WINDOW_HEIGHT
+from weapons import Pistol, Shotgun, Sword, AutoRifle, GunSprite, Bullet, BulletPool, WeaponItem
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, assets, game_clock, inputs
 
 
 class Player(pygame.sprite.Sprite):
@@ -34,6 +34,7 @@ class Player(pygame.sprite.Sprite):
         # collision
         self.collision_sprites = collision_sprites
         self.enemy_sprites = enemy_sprites
+        self.swarm = None  # роевой движок, если враги живут в нём
         
         # stats
         self.max_health = 1000  # Максимальное здоровье
@@ -47,7 +48,11 @@ class Player(pygame.sprite.Sprite):
         self.experience_to_next_level = 300  # Базовое количество опыта для 2 уровня
         
         # weapon system
-        self.bullet_sprites = pygame.sprite.Group()
+        # Пули игрока живут в пуле массивов; без NumPy - обычная группа спрайтов
+        if BulletPool.available:
+            self.bullet_sprites = BulletPool(assets.image(os.path.join('..', 'images', 'gun', 'bullet.png')))
+        else:
+            self.bullet_sprites = pygame.sprite.Group()
         self.weapons = [
             Pistol(self, {'all': groups, 'bullet': self.bullet_sprites})
         ]
@@ -60,7 +65,7 @@ class Player(pygame.sprite.Sprite):
         self.gun = GunSprite(self, groups)
         
         # Добавляем задержку для выбрасывания оружия
-        self.last_drop_time = 0
+        self.can_drop = True
         self.drop_cooldown = 500  # 500 миллисекунд между выбрасываниями
 
     def import_assets(self):
@@ -70,12 +75,8 @@ class Player(pygame.sprite.Sprite):
         for animation in self.animations.keys():
             full_path = os.path.join('..', 'images', 'player', animation)
             try:
-                self.animations[animation] = []
-                for frame_file in sorted(os.listdir(full_path)):
-                    if frame_file.endswith('.png'):
-                        frame_path = os.path.join(full_path, frame_file)
-                        frame_surf = pygame.image.load(frame_path).convert_alpha()
-                        self.animations[animation].append(frame_surf)
+                # Кадры общие для всех игр - повторно с диска не грузятся
+                self.animations[animation] = assets.frames(full_path, extension='.png')
             except Exception as e:
                 print(f'Ошибка загрузки анимации {animation}: {e}')
                 # Создаем временное изображение если загрузка не удалась
@@ -143,39 +144,43 @@ class Player(pygame.sprite.Sprite):
             weapon_dir = self.get_weapon_direction()
             if self.current_weapon is not None:
                 self.current_weapon.update_position(pygame.math.Vector2(self.rect.center), weapon_dir)
-                self.current_weapon.update_timer(self.current_weapon.cooldown)
 
     def input(self):
         if not self.alive:
             return
 
-        keys = pygame.key.get_pressed()
+        # Ввод за текущий шаг симуляции (живой, скриптовый или из реплея)
+        frame = inputs.frame
+        keys = frame.pressed
         
         # Movement
-        self.direction.x = int(keys[pygame.K_RIGHT] or keys[pygame.K_d]) - int(keys[pygame.K_LEFT] or keys[pygame.K_a])
-        self.direction.y = int(keys[pygame.K_DOWN] or keys[pygame.K_s]) - int(keys[pygame.K_UP] or keys[pygame.K_w])
+        self.direction.x = int(keys(pygame.K_RIGHT) or keys(pygame.K_d)) - int(keys(pygame.K_LEFT) or keys(pygame.K_a))
+        self.direction.y = int(keys(pygame.K_DOWN) or keys(pygame.K_s)) - int(keys(pygame.K_UP) or keys(pygame.K_w))
         self.direction = self.direction.normalize() if self.direction else self.direction
 
         # Weapon switching
-        if keys[pygame.K_1]:
+        if keys(pygame.K_1):
             self.switch_weapon(0)
-        elif keys[pygame.K_2]:
+        elif keys(pygame.K_2):
             self.switch_weapon(1)
-        elif keys[pygame.K_3]:
+        elif keys(pygame.K_3):
             self.switch_weapon(2)
 
         # Drop weapon with cooldown
-        current_time = pygame.time.get_ticks()
-        if keys[pygame.K_q] and current_time - self.last_drop_time >= self.drop_cooldown:
+        if keys(pygame.K_q) and self.can_drop:
             self.drop_weapon()
-            self.last_drop_time = current_time
+            self.can_drop = False
+            game_clock.schedule(self.drop_cooldown, self.allow_drop)
 
         # Shooting
-        if pygame.mouse.get_pressed()[0] and self.current_weapon is not None:
+        if frame.mouse_buttons[0] and self.current_weapon is not None:
             self.current_weapon.shoot()
 
+    def allow_drop(self):
+        self.can_drop = True
+
     def get_weapon_direction(self):
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = inputs.frame.mouse_pos
         screen_center = pygame.math.Vector2(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
         direction = pygame.math.Vector2(mouse_pos) - screen_center
 
@@ -226,23 +231,11 @@ class Player(pygame.sprite.Sprite):
     def check_death(self):
         if self.health <= 0 and self.alive:
             self.alive = False
-            self.death_time = pygame.time.get_ticks()
+            self.death_time = game_clock.ticks()
 
     def collision(self, direction):
-        # Коллизия с окружением
-        for sprite in self.collision_sprites:
-            if sprite.rect.colliderect(self.hitbox_rect):
-                if direction == 'horizontal':
-                    if self.direction.x > 0:  # moving right
-                        self.hitbox_rect.right = sprite.rect.left
-                    if self.direction.x < 0:  # moving left
-                        self.hitbox_rect.left = sprite.rect.right
-
-                if direction == 'vertical':
-                    if self.direction.y > 0:  # moving down
-                        self.hitbox_rect.bottom = sprite.rect.top
-                    if self.direction.y < 0:  # moving up
-                        self.hitbox_rect.top = sprite.rect.bottom
+        # Коллизия с окружением - проверяются только коллайдеры из клеток под хитбоксом
+        self.collision_sprites.resolve(self.hitbox_rect, direction, self.direction)
 
         # Коллизия с врагами
         for enemy in self.enemy_sprites:
@@ -259,6 +252,10 @@ class Player(pygame.sprite.Sprite):
                     if self.direction.y < 0:  # moving up
                         self.hitbox_rect.top = enemy.hitbox_rect.bottom
 
+        # Коллизия с агентами роя
+        if self.swarm:
+            self.swarm.block_player(self.hitbox_rect, direction, self.direction)
+
     def draw_hitbox(self, surface, offset):
         rect_with_offset = self.hitbox_rect.copy()
         rect_with_offset.topleft += offset
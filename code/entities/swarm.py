@@ -0,0 +1,373 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy роевой движок недоступен, враги остаются спрайтами
+    np = None
+
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, game_clock, rng
+from weapons import AutoRifle, Shotgun
+from .effects import flash_cache
+from .enemy import EXPERIENCE_REWARDS, drop_weapon
+
+# Параметры, общие с объектным Enemy
+ANIMATION_SPEED = 15
+DEATH_DURATION = 600
+HIT_EFFECT_DURATION = 300
+ATTACK_DISTANCE = 100
+HITBOX_SCALE = 0.4
+WEAPON_DROP_CHANCE = 0.3
+POSSIBLE_WEAPONS = [AutoRifle, Shotgun]
+
+# Ступени затухания силуэта при смерти
+DEATH_FADE_LEVELS = 8
+# Размер клетки растра коллизий
+BLOCK_CELL = 16
+
+
+class SwarmView:
+    """Лёгкое представление агента для отрисовки (image + rect, как у спрайта)"""
+    __slots__ = ('image', 'rect')
+
+    def __init__(self):
+        self.image = None
+        self.rect = pygame.FRect()
+
+
+class Archetype:
+    """Тип врага в рое: кадры и базовые характеристики класса"""
+
+    def __init__(self, enemy_class, frames):
+        self.name = enemy_class.__name__
+        self.frames = frames
+        self.size = frames[0].get_size()
+        self.speed = enemy_class.speed
+        self.max_health = enemy_class.max_health
+        self.damage = enemy_class.damage
+        self.attack_cooldown = enemy_class.attack_cooldown
+        self.experience = EXPERIENCE_REWARDS.get(self.name, 5)
+
+        flash_cache.prepare(frames)
+        # Силуэты смерти для каждого кадра и ступени прозрачности
+        self.death_frames = []
+        for frame in frames:
+            silhouette = pygame.mask.from_surface(frame).to_surface(setcolor=(0, 0, 0, 180),
+                                                                    unsetcolor=(0, 0, 0, 0))
+            levels = []
+            for level in range(DEATH_FADE_LEVELS):
+                faded = silhouette.copy()
+                alpha = int(255 * (1 - level / DEATH_FADE_LEVELS))
+                faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                levels.append(faded)
+            self.death_frames.append(levels)
+
+
+class Swarm:
+    """Рой обычных врагов в виде массивов NumPy (structure of arrays)"""
+    available = np is not None
+
+    def __init__(self, player, collision_sprites, all_sprites, capacity=256):
+        self.player = player
+        self.all_sprites = all_sprites
+        # Общее поле обхода препятствий (FlowField), задаётся игрой
+        self.flow_field = None
+        self.archetypes = []
+        self.archetype_ids = {}
+
+        self.capacity = 0
+        self.size = 0  # Граница занятых слотов
+        self.free_slots = []
+        self.views = []
+        self.grow(capacity)
+
+        self.build_block_grid(collision_sprites)
+        self.hp_bar_width = 48
+        self.hp_bar_height = 6
+
+    def grow(self, capacity):
+        """Увеличивает массивы до capacity слотов"""
+        def extend(array, shape, fill=0):
+            new = np.full(shape, fill, dtype=array.dtype if array is not None else float)
+            if array is not None:
+                new[:len(array)] = array
+            return new
+
+        old = self.capacity
+        self.pos = extend(getattr(self, 'pos', None), (capacity, 2))
+        self.previous_pos = extend(getattr(self, 'previous_pos', None), (capacity, 2))
+        self.vel = extend(getattr(self, 'vel', None), (capacity, 2))
+        self.health = extend(getattr(self, 'health', None), capacity)
+        self.max_health = extend(getattr(self, 'max_health', None), capacity, 1)
+        self.damage = extend(getattr(self, 'damage', None), capacity)
+        self.speed = extend(getattr(self, 'speed', None), capacity)
+        self.cooldown = extend(getattr(self, 'cooldown', None), capacity)
+        self.last_attack = extend(getattr(self, 'last_attack', None), capacity)
+        self.anim_clock = extend(getattr(self, 'anim_clock', None), capacity)
+        self.death_time = extend(getattr(self, 'death_time', None), capacity)
+        self.hit_time = extend(getattr(self, 'hit_time', None), capacity, -HIT_EFFECT_DURATION)
+        self.hit_damage = extend(getattr(self, 'hit_damage', None), capacity)
+        self.half_size = extend(getattr(self, 'half_size', None), (capacity, 2))
+        self.archetype = extend(getattr(self, 'archetype', np.zeros(0, dtype=int)), capacity)
+        self.active = extend(getattr(self, 'active', np.zeros(0, dtype=bool)), capacity, False)
+        self.views.extend(SwarmView() for _ in range(capacity - old))
+        self.capacity = capacity
+
+    def build_block_grid(self, collision_sprites):
+        """Растеризует статичные коллайдеры в булеву сетку"""
+        rects = [sprite.rect for sprite in collision_sprites]
+        right = max([rect.right for rect in rects] + [WINDOW_WIDTH])
+        bottom = max([rect.bottom for rect in rects] + [WINDOW_HEIGHT])
+        self.blocked = np.zeros((int(right // BLOCK_CELL) + 2, int(bottom // BLOCK_CELL) + 2), dtype=bool)
+        for rect in rects:
+            x0, y0 = int(max(0, rect.left) // BLOCK_CELL), int(max(0, rect.top) // BLOCK_CELL)
+            x1, y1 = int(max(0, rect.right - 1) // BLOCK_CELL), int(max(0, rect.bottom - 1) // BLOCK_CELL)
+            self.blocked[x0:x1 + 1, y0:y1 + 1] = True
+
+    def add_archetype(self, name, enemy_class, frames):
+        self.archetype_ids[name] = len(self.archetypes)
+        self.archetypes.append(Archetype(enemy_class, frames))
+
+    @property
+    def alive_mask(self):
+        return self.active[:self.size] & (self.death_time[:self.size] == 0)
+
+    @property
+    def count(self):
+        """Число занятых слотов (живые и умирающие агенты)"""
+        return int(self.active[:self.size].sum())
+
+    def spawn(self, name, pos, health_multiplier=1.0, damage_multiplier=1.0):
+        archetype_id = self.archetype_ids[name]
+        archetype = self.archetypes[archetype_id]
+        if self.free_slots:
+            i = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self.grow(self.capacity * 2)
+            i = self.size
+            self.size += 1
+
+        self.pos[i] = pos
+        self.previous_pos[i] = pos
+        self.vel[i] = 0
+        self.health[i] = self.max_health[i] = int(archetype.max_health * health_multiplier)
+        self.damage[i] = int(archetype.damage * damage_multiplier)
+        self.speed[i] = archetype.speed
+        self.cooldown[i] = archetype.attack_cooldown
+        self.last_attack[i] = 0
+        self.anim_clock[i] = 0
+        self.death_time[i] = 0
+        self.hit_time[i] = -HIT_EFFECT_DURATION
+        self.half_size[i] = (archetype.size[0] * HITBOX_SCALE / 2, archetype.size[1] * HITBOX_SCALE / 2)
+        self.archetype[i] = archetype_id
+        self.active[i] = True
+        return i
+
+    def is_blocked(self, centers, half_size):
+        """Задевает ли хитбокс (9 точек по краям и центру) заблокированные клетки"""
+        blocked = np.zeros(len(centers), dtype=bool)
+        width, height = self.blocked.shape
+        for fx in (-1, 0, 1):
+            for fy in (-1, 0, 1):
+                cx = ((centers[:, 0] + fx * half_size[:, 0]) // BLOCK_CELL).astype(int)
+                cy = ((centers[:, 1] + fy * half_size[:, 1]) // BLOCK_CELL).astype(int)
+                inside = (cx >= 0) & (cy >= 0) & (cx < width) & (cy < height)
+                blocked[inside] |= self.blocked[cx[inside], cy[inside]]
+        return blocked
+
+    def flow_directions(self, centers, fallback):
+        """Направления из поля обхода препятствий: по одному запросу на занятую клетку"""
+        field = self.flow_field
+        cells = (centers // field.cell_size).astype(int)
+        inside = ((cells[:, 0] >= 0) & (cells[:, 1] >= 0) &
+                  (cells[:, 0] < field.width) & (cells[:, 1] < field.height))
+        indices = np.where(inside, cells[:, 1] * field.width + cells[:, 0], -1)
+        unique, inverse = np.unique(indices, return_inverse=True)
+
+        table = np.zeros((len(unique), 2))
+        valid = np.zeros(len(unique), dtype=bool)
+        for k, index in enumerate(unique.tolist()):
+            direction = field.cell_direction(index) if index >= 0 else None
+            if direction:
+                table[k] = direction
+                valid[k] = True
+        inverse = inverse.reshape(-1)
+        return np.where(valid[inverse][:, None], table[inverse], fallback)
+
+    def overlaps_player(self, centers, half_size):
+        hitbox = self.player.hitbox_rect
+        return ((np.abs(centers[:, 0] - hitbox.centerx) < half_size[:, 0] + hitbox.width / 2) &
+                (np.abs(centers[:, 1] - hitbox.centery) < half_size[:, 1] + hitbox.height / 2))
+
+    def block_player(self, hitbox, direction, velocity):
+        """Коллизия игрока с живыми агентами, как с Enemy: хитбокс упирается в край по оси движения"""
+        if not self.size:
+            return
+        alive = np.nonzero(self.alive_mask)[0]
+        if not len(alive):
+            return
+        centers = self.pos[alive]
+        half_size = self.half_size[alive]
+        touching = self.overlaps_player(centers, half_size)
+        if not touching.any():
+            return
+        centers = centers[touching]
+        half_size = half_size[touching]
+        axis, speed = (0, velocity.x) if direction == 'horizontal' else (1, velocity.y)
+        if speed > 0:
+            edge = float((centers[:, axis] - half_size[:, axis]).min())
+            if axis == 0:
+                hitbox.right = edge
+            else:
+                hitbox.bottom = edge
+        elif speed < 0:
+            edge = float((centers[:, axis] + half_size[:, axis]).max())
+            if axis == 0:
+                hitbox.left = edge
+            else:
+                hitbox.top = edge
+
+    def update(self, dt):
+        if not self.size:
+            return
+        current_time = game_clock.ticks()
+        alive = np.nonzero(self.alive_mask)[0]
+
+        if len(alive):
+            pos = self.pos[alive]
+            half_size = self.half_size[alive]
+
+            # Направление на игрока для всех сразу
+            delta = np.array(self.player.rect.center, dtype=float) - pos
+            length = np.hypot(delta[:, 0], delta[:, 1])
+            direction = np.divide(delta, length[:, None], out=np.zeros_like(delta), where=length[:, None] > 0)
+            if self.flow_field:
+                direction = self.flow_directions(pos, direction)
+            step = direction * (self.speed[alive] * dt)[:, None]
+            self.vel[alive] = step
+
+            # Движение по осям отдельно, как у Enemy: упёрся - остаётся на месте по этой оси
+            for axis in (0, 1):
+                moved = pos.copy()
+                moved[:, axis] += step[:, axis]
+                stuck = self.is_blocked(moved, half_size) | self.overlaps_player(moved, half_size)
+                pos = np.where(stuck[:, None], pos, moved)
+            self.pos[alive] = pos
+
+            # Атака всех, кто рядом и у кого прошла перезарядка
+            ready = (length <= ATTACK_DISTANCE) & (current_time - self.last_attack[alive] >= self.cooldown[alive])
+            if ready.any():
+                attackers = alive[ready]
+                self.player.health -= int(self.damage[attackers].sum())
+                self.last_attack[attackers] = current_time
+
+            self.anim_clock[alive] += ANIMATION_SPEED * dt
+
+        # Убираем тех, у кого закончилась анимация смерти
+        dying = np.nonzero(self.active[:self.size] & (self.death_time[:self.size] > 0) &
+                           (current_time - self.death_time[:self.size] >= DEATH_DURATION))[0]
+        for i in dying:
+            self.active[i] = False
+            self.free_slots.append(int(i))
+            roll = rng.random()
+            if roll < WEAPON_DROP_CHANCE:
+                drop_weapon(self.player, self.all_sprites, tuple(self.pos[i]), POSSIBLE_WEAPONS)
+
+    def first_hit(self, center, radius):
+        """Индекс первого живого агента, в чей вписанный круг попадает круг пули"""
+        if not self.size:
+            return None
+        alive = np.nonzero(self.alive_mask)[0]
+        if not len(alive):
+            return None
+        offset = self.pos[alive] - center
+        reach = self.half_size[alive].min(axis=1) / HITBOX_SCALE + radius
+        hits = np.nonzero((offset ** 2).sum(axis=1) <= reach * reach)[0]
+        return int(alive[hits[0]]) if len(hits) else None
+
+    def sector_damage(self, origin, direction, reach, half_angle, damage):
+        """Удар сектором (меч) по всем агентам сразу"""
+        if not self.size:
+            return
+        alive = np.nonzero(self.alive_mask)[0]
+        if not len(alive):
+            return
+        offset = self.pos[alive] - np.array(origin, dtype=float)
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        radius = self.half_size[alive].min(axis=1) / HITBOX_SCALE
+        facing = np.array((direction.x, direction.y), dtype=float)
+        cos_angle = np.divide(offset @ facing, distance, out=np.ones_like(distance), where=distance > 0)
+        angle = np.degrees(np.arccos(np.clip(cos_angle, -1, 1)))
+        tolerance = np.degrees(np.arcsin(np.clip(np.divide(radius, distance, out=np.ones_like(distance),
+                                                           where=distance > 0), 0, 1)))
+        hit = (distance - radius <= reach) & (angle <= half_angle + tolerance)
+        for i in alive[hit]:
+            self.take_damage(int(i), damage)
+
+    def take_damage(self, i, amount):
+        if not self.active[i] or self.death_time[i]:
+            return
+        current_time = game_clock.ticks()
+        self.health[i] -= amount
+        self.hit_time[i] = current_time
+        self.hit_damage[i] = amount
+        if self.health[i] <= 0:
+            self.death_time[i] = current_time
+            if hasattr(self.player, 'hud'):
+                self.player.hud.add_kill()
+            if hasattr(self.player, 'add_experience'):
+                self.player.add_experience(self.archetypes[self.archetype[i]].experience)
+
+    def visible(self, view_rect):
+        """Индексы агентов внутри view_rect"""
+        if not self.size:
+            return np.zeros(0, dtype=int)
+        pos = self.pos[:self.size]
+        inside = (self.active[:self.size] &
+                  (pos[:, 0] >= view_rect.left) & (pos[:, 0] <= view_rect.right) &
+                  (pos[:, 1] >= view_rect.top) & (pos[:, 1] <= view_rect.bottom))
+        return np.nonzero(inside)[0]
+
+    def begin_step(self):
+        """Запоминает позиции перед шагом симуляции (для интерполяции при отрисовке)"""
+        self.previous_pos[:self.size] = self.pos[:self.size]
+
+    def visible_views(self, view_rect, alpha=1.0):
+        """Видимые агенты, отсортированные по глубине, в виде SwarmView"""
+        indices = self.visible(view_rect)
+        if not len(indices):
+            return []
+        indices = indices[np.argsort(self.pos[indices, 1], kind='stable')]
+        current_time = game_clock.ticks()
+        views = []
+        for i in indices:
+            archetype = self.archetypes[self.archetype[i]]
+            frame_index = int(self.anim_clock[i]) % len(archetype.frames)
+            if self.death_time[i]:
+                progress = (current_time - self.death_time[i]) / DEATH_DURATION
+                level = min(DEATH_FADE_LEVELS - 1, int(progress * DEATH_FADE_LEVELS))
+                image = archetype.death_frames[frame_index][level]
+            else:
+                image = archetype.frames[frame_index]
+                elapsed = current_time - self.hit_time[i]
+                if elapsed < HIT_EFFECT_DURATION:
+                    image = flash_cache.brightened(image, elapsed / HIT_EFFECT_DURATION)
+            view = self.views[i]
+            view.image = image
+            view.rect.size = archetype.size
+            previous = self.previous_pos[i]
+            view.rect.center = previous + (self.pos[i] - previous) * alpha
+            views.append(view)
+        return views
+
+    def hp_bar_entries(self, view_rect, current_time, alpha=1.0):
+        """Полоски здоровья видимых живых агентов для WorldOverlay: (centerx, верх, доля здоровья, урон)"""
+        for i in self.visible(view_rect):
+            if self.death_time[i]:
+                continue
+            height = self.archetypes[self.archetype[i]].size[1]
+            damage = int(self.hit_damage[i]) if current_time - self.hit_time[i] < HIT_EFFECT_DURATION else None
+            previous = self.previous_pos[i]
+            x, y = previous + (self.pos[i] - previous) * alpha
+            yield (x, y - height / 2 - 15,
+                   self.health[i] / self.max_health[i], damage)
@@ -1,37 +1,62 @@
 import pygame
 import os
 import sys
+import time
+import argparse
 from os.path import join
 from os import walk
 
 # Добавляем корневую директорию проекта в Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import random
-from random import randint, choice
-
 from core import (
-    WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE,
-    load_settings, save_settings, GameState
+    WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, USE_SWARM,
+    SIM_RATE, FRAME_CAP, MENU_FRAME_CAP, PAUSE_DIM, VSYNC, MAX_FRAME_TIME, RECORD_REPLAY, REPLAY_PATH,
+    load_settings, save_settings, GameState, assets, first_hit,
+    game_clock, inputs, LiveInput, NullInput, rng,
+    Replay, InputRecorder, ReplayInput, governor
 )
-from sprites import Sprite, CollisionSprite, AllSprites
-from weapons import Sword, WeaponItem
-from pytmx.util_pygame import load_pygame
-from entities import Player, Boss, Bat, Slime, Skeleton
+from sprites import CollisionSprite, AllSprites, CollisionSprites, GroundLayer, SpatialGrid
+from weapons import Sword, WeaponItem, BulletPool
+from world import load_map, FlowField
+from entities import Player, Boss, Bat, Slime, Skeleton, Swarm, LODScheduler, SpawnDirector, WorldOverlay
 from ui import HUD, MainMenu, PauseMenu, GameOverMenu, SettingsMenu, GameParamsMenu
 
 
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
+# Класс врага по папке с кадрами (всё остальное - скелеты)
+ENEMY_CLASSES = {
+    'bat': Bat,
+    'blob': Slime,
+}
+
+
+def frame_number(file_name):
+    """Номер кадра из имени файла вида '3.png'"""
+    return int(file_name.split('.')[0])
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False):
+        # Без окна: пустые драйверы SDL, без музыки, меню и отрисовки
+        self.headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
         # setup
         pygame.init()
-        self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.display_surface = self.create_window()
         pygame.display.set_caption('Большие S')
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # Фиксированный шаг симуляции; остаток времени копится между кадрами
+        self.sim_step = 1 / SIM_RATE
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
         # Загружаем настройки звука
         self.music_volume, self.sound_volume = load_settings()
 
@@ -40,11 +65,15 @@ class Game:
         pygame.mouse.set_visible(True)  # Показываем курсор в главном меню
         
         # Меню
-        self.main_menu = MainMenu()
-        self.pause_menu = PauseMenu()
-        self.game_over_menu = GameOverMenu()
-        self.settings_menu = SettingsMenu()
-        self.game_params_menu = GameParamsMenu()
+        if not headless:
+            self.main_menu = MainMenu()
+            self.pause_menu = PauseMenu()
+            self.game_over_menu = GameOverMenu()
+            self.settings_menu = SettingsMenu()
+            self.game_params_menu = GameParamsMenu()
+
+        # Слой поверх мира: готовые кадры полосок здоровья общие для всех матчей
+        self.overlay = WorldOverlay()
 
         # Параметры игры
         self.difficulty = 1  # 0-Легко, 1-Средне, 2-Сложно
@@ -70,7 +99,7 @@ class Game:
         }
 
         # crosshair
-        self.crosshair_image = pygame.image.load(join('..', 'images', 'ui', 'crosshair.png')).convert_alpha()
+        self.crosshair_image = assets.image(join('..', 'images', 'ui', 'crosshair.png'))
 
         # Игровые объекты (создаются только при старте игры)
         self.all_sprites = None
@@ -79,9 +108,19 @@ class Game:
         self.enemy_sprites = None
         self.player = None
         self.hud = None
+        self.swarm = None
+        self.use_swarm = USE_SWARM
+        self.flow_field = None
+        self.lod = None
+
+        # Запись ввода текущего матча (Replay), сохраняется по его окончании
+        self.replay = None
 
-        # Спавн врагов
-        self.enemy_event = pygame.event.custom_type()
+        # Пространственный хэш живых врагов, пересобирается каждый кадр для проверки попаданий
+        self.enemy_grid = SpatialGrid(TILE_SIZE * 2)
+
+        # Спавн обычных врагов волнами (SpawnDirector) по времени симуляции
+        self.director = None
         self.boss_event = pygame.event.custom_type()  # Новый тип события для босса
         self.spawn_positions = []
         self.last_boss_spawn = 0  # Время последнего спавна босса
@@ -90,51 +129,72 @@ class Game:
         self.initial_boss_delay = True  # Флаг для первого спавна
 
         # audio 
-        self.music = pygame.mixer.Sound(join('..', 'audio', 'music.wav'))
-        self.music.set_volume(self.music_volume)
-        self.music.play(loops = -1)
-        self.impact_sound = pygame.mixer.Sound(join('..', 'audio', 'impact.ogg'))
+        self.music = None
+        if not headless:
+            self.music = assets.sound(join('..', 'audio', 'music.wav'))
+            self.music.set_volume(self.music_volume)
+            self.music.play(loops = -1)
+        self.impact_sound = assets.sound(join('..', 'audio', 'impact.ogg'))
         self.impact_sound.set_volume(self.sound_volume)
 
         # Изображения (загружаем один раз)
         self.load_images()
 
+    def create_window(self):
+        """Окно игры; vsync включается, только если драйвер его поддерживает"""
+        if VSYNC:
+            try:
+                return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"Vsync недоступен: {e}")
+        return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
     def load_images(self):
-        self.bullet_surf = pygame.image.load(join('..', 'images', 'gun', 'bullet.png')).convert_alpha()
+        self.bullet_surf = assets.image(join('..', 'images', 'gun', 'bullet.png'))
 
-        folders = list(walk(join('..', 'images', 'enemies')))[0][1]
+        # Сортировка - чтобы выбор типа врага не зависел от порядка файлов в ОС
+        folders = sorted(list(walk(join('..', 'images', 'enemies')))[0][1])
         self.enemy_frames = {}
         for folder in folders:
-            for folder_path, _, file_names in walk(join('..', 'images', 'enemies', folder)):
-                self.enemy_frames[folder] = []
-                if folder == 'Boss':
-                    # Для папки Boss просто загружаем изображения без сортировки по номерам
-                    for file_name in file_names:
-                        full_path = join(folder_path, file_name)
-                        surf = pygame.image.load(full_path).convert_alpha()
-                        self.enemy_frames[folder].append(surf)
-                else:
-                    # Для остальных папок используем числовую сортировку
-                    for file_name in sorted(file_names, key=lambda name: int(name.split('.')[0])):
-                        full_path = join(folder_path, file_name)
-                        surf = pygame.image.load(full_path).convert_alpha()
-                        self.enemy_frames[folder].append(surf)
-
-    def init_game(self):
+            folder_path = join('..', 'images', 'enemies', folder)
+            if folder == 'Boss':
+                # Для папки Boss просто загружаем изображения без сортировки по номерам
+                self.enemy_frames[folder] = assets.frames(folder_path)
+            else:
+                # Для остальных папок используем числовую сортировку
+                self.enemy_frames[folder] = assets.frames(folder_path, key=frame_number)
+
+    def init_game(self, seed=None, input_source=None):
         """Инициализация игровых объектов"""
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
+        # Одно зерно и одинаковый ввод по шагам дают один и тот же матч
+        seed = rng.reseed(seed)
+        game_clock.reset()
+        self.replay = None
+        if input_source is None and not self.headless:
+            input_source = LiveInput()
+            if RECORD_REPLAY:
+                self.replay = Replay(seed, self.selected_map, self.difficulty, self.use_swarm, SIM_RATE)
+                input_source = InputRecorder(input_source, self.replay)
+        inputs.source = input_source or NullInput()
+
+        # Частота обновления врагов по расстоянию до камеры
+        self.lod = LODScheduler()
+        # Новый матч начинается с полной детализацией
+        governor.reset()
+
         # groups 
         self.all_sprites = AllSprites()
-        self.collision_sprites = pygame.sprite.Group()
+        self.collision_sprites = CollisionSprites()
         self.enemy_sprites = pygame.sprite.Group()
 
         # Сброс позиций спавна
         self.spawn_positions = []
         
-        # Таймер спавна врагов
-        pygame.time.set_timer(self.enemy_event, 300)
-        
         # Сброс времени спавна босса
-        self.last_boss_spawn = pygame.time.get_ticks()
+        self.last_boss_spawn = game_clock.ticks()
         self.boss_spawn_timer = 0
         self.initial_boss_delay = True  # Флаг для первого спавна
 
@@ -148,6 +208,27 @@ class Game:
         # setup
         self.setup()
 
+        # Роевой движок для обычных врагов (если включён и есть NumPy)
+        self.swarm = None
+        if self.use_swarm and Swarm.available and self.player:
+            self.swarm = Swarm(self.player, self.collision_sprites, self.all_sprites)
+            self.swarm.flow_field = self.flow_field
+            for enemy_type, frames in self.enemy_frames.items():
+                if enemy_type != 'Boss':
+                    self.swarm.add_archetype(enemy_type, ENEMY_CLASSES.get(enemy_type, Skeleton), frames)
+        self.all_sprites.swarm = self.swarm
+        if self.player:
+            self.player.swarm = self.swarm
+
+        # Директор волн: бюджеты, веса типов и предел численности по сложности
+        self.director = SpawnDirector(self.spawn_positions,
+                                      [name for name in self.enemy_frames if name != 'Boss'],
+                                      self.difficulty,
+                                      self.difficulty_multipliers[self.difficulty]['spawn_rate'])
+        # Пул пуль игрока рисуется одним пакетом поверх сущностей
+        if self.player and isinstance(self.player.bullet_sprites, BulletPool):
+            self.all_sprites.bullets = self.player.bullet_sprites
+
         # После создания игрока присваиваем его HUD'у
         if self.player:
             self.hud.player = self.player
@@ -160,27 +241,30 @@ class Game:
         
         # Загружаем карту в зависимости от выбора
         map_file = 'world1.tmx' if self.selected_map == 0 else 'world2.tmx'
-        tmx_data = load_pygame(join('..', 'data', 'maps', map_file))
+        # Карта берётся из скомпилированного кэша, TMX разбирается только при изменениях
+        map_data = load_map(join('..', 'data', 'maps', map_file))
         
-        # Создаем тайлы
-        for x, y, surf in tmx_data.get_layer_by_name('Ground').tiles():
-            pos = (x * TILE_SIZE, y * TILE_SIZE)
-            Sprite(pos, surf, [self.all_sprites])
+        # Запекаем слой земли в чанки вместо отдельного спрайта на каждый тайл
+        self.all_sprites.ground_layer = GroundLayer(map_data.ground_tiles())
             
-        for obj in tmx_data.get_layer_by_name('Objects'):
-            CollisionSprite((obj.x, obj.y), obj.image, (self.all_sprites, self.collision_sprites))
+        for x, y, image in map_data.object_images():
+            CollisionSprite((x, y), image, (self.all_sprites, self.collision_sprites))
         
-        for obj in tmx_data.get_layer_by_name('Collisions'):
-            CollisionSprite((obj.x, obj.y), pygame.Surface((obj.width, obj.height)), self.collision_sprites)
+        for x, y, width, height in map_data.collisions:
+            CollisionSprite((x, y), pygame.Surface((width, height)), self.collision_sprites)
+
+        # Сетка проходимости для поля направлений врагов (все коллайдеры, включая объекты)
+        self.flow_field = FlowField.from_rects([sprite.rect for sprite in self.collision_sprites],
+                                               map_data.width, map_data.height, map_data.tile_size)
             
         # Создаем списки для точек спавна
         self.spawn_positions = []
         self.boss_spawn_positions = []
         
         # Создаем игрока и обрабатываем точки спавна
-        for obj in tmx_data.get_layer_by_name('Entities'):
-            pos = (obj.x, obj.y)
-            if obj.name == 'Player':
+        for name, x, y in map_data.entities:
+            pos = (x, y)
+            if name == 'Player':
                 self.player = Player(
                     pos,
                     [self.all_sprites],
@@ -190,14 +274,14 @@ class Game:
                 )
                 # Присваиваем HUD игроку
                 self.player.hud = self.hud
-            elif obj.name == 'Boss':
+            elif name == 'Boss':
                 # Проверяем расстояние для точки спавна босса
                 if self.player:
                     player_pos = pygame.math.Vector2(self.player.rect.center)
                     spawn_pos = pygame.math.Vector2(pos)
                     if player_pos.distance_to(spawn_pos) > 200:  # Увеличенная дистанция для босса
                         self.boss_spawn_positions.append(pos)
-            elif obj.name == 'Enemy':
+            elif name == 'Enemy':
                 # Проверка расстояния для обычных врагов
                 if self.player:
                     player_pos = pygame.math.Vector2(self.player.rect.center)
@@ -220,16 +304,48 @@ class Game:
                 
                 self.state = GameState.GAME_OVER
                 pygame.mouse.set_visible(True)
+                governor.report()
+                self.save_replay()
+
+    def save_replay(self):
+        """Сохраняет запись закончившегося матча"""
+        if self.replay is None:
+            return
+        try:
+            self.replay.save(REPLAY_PATH)
+        except OSError as e:
+            print(f"Не удалось сохранить реплей: {e}")
+        self.replay = None
 
     def bullet_collision(self):
         # Проверяем столкновения пуль с врагами
-        for enemy in self.enemy_sprites:
+        if not self.player.bullet_sprites:
+            return
+        bullets = self.player.bullet_sprites.sprites()
+
+        # Раскладываем живых врагов по клеткам, запоминая порядок группы
+        self.enemy_grid.clear()
+        enemy_order = {}
+        for index, enemy in enumerate(self.enemy_sprites):
             if enemy.death_time == 0:  # Проверяем, что враг жив
-                for bullet in self.player.bullet_sprites:
-                    if pygame.sprite.collide_mask(bullet, enemy):
-                        bullet.kill()
-                        enemy.take_damage(self.player.current_weapon.damage)
-                        self.impact_sound.play()
+                self.enemy_grid.insert(enemy, enemy.rect)
+                enemy_order[enemy] = index
+
+        # Каждая пуля проверяет только соседних врагов; попадает в первого по порядку группы
+        for bullet in bullets:
+            nearby = sorted(self.enemy_grid.query(bullet.rect), key=enemy_order.__getitem__)
+            enemy = first_hit(bullet, nearby)
+            if enemy:
+                bullet.kill()
+                enemy.take_damage(self.player.current_weapon.damage)
+                self.impact_sound.play()
+            elif self.swarm:
+                # Попадание в рой проверяется одной векторной операцией
+                index = self.swarm.first_hit(bullet.shape.world_center(bullet), bullet.shape.radius)
+                if index is not None:
+                    bullet.kill()
+                    self.swarm.take_damage(index, self.player.current_weapon.damage)
+                    self.impact_sound.play()
 
     def enemy_attacks(self):
         for enemy in self.enemy_sprites:
@@ -267,6 +383,8 @@ class Game:
             elif result == "в меню":
                 self.state = GameState.MAIN_MENU
                 pygame.mouse.set_visible(True)
+                governor.report()
+                self.save_replay()
                 
         elif self.state == GameState.GAME_OVER:
             result = self.game_over_menu.handle_event(event)
@@ -288,13 +406,13 @@ class Game:
             save_settings(self.settings_menu.music_slider.value, 
                          self.settings_menu.sound_slider.value)
 
-    def spawn_boss(self):
+    def spawn_boss(self, dt):
         """Спавн босса в одной из предназначенных точек спавна"""
         if not self.player or not self.boss_spawn_positions:
             return
 
-        self.boss_spawn_timer += self.clock.get_time()  # Добавляем прошедшее время
-        time_until_boss = (self.boss_spawn_interval - self.boss_spawn_timer) // 1000  # Время до босса в секундах
+        self.boss_spawn_timer += dt * 1000  # Добавляем время шага симуляции
+        time_until_boss = int((self.boss_spawn_interval - self.boss_spawn_timer) // 1000)  # Время до босса в секундах
         
         # Обновляем информацию о времени до босса в HUD
         if self.hud:
@@ -309,7 +427,7 @@ class Game:
         # Проверяем, прошло ли достаточно времени с последнего спавна
         if self.boss_spawn_timer >= self.boss_spawn_interval:
             # Выбираем случайную точку спавна для босса
-            spawn_pos = choice(self.boss_spawn_positions)
+            spawn_pos = rng.choice(self.boss_spawn_positions)
             
             # Создаем босса
             Boss(
@@ -322,21 +440,105 @@ class Game:
             # Сбрасываем таймер
             self.boss_spawn_timer = 0
 
+    def update_world(self, dt):
+        """Один шаг симуляции фиксированной длины"""
+        game_clock.advance(dt)
+        inputs.poll()
+        self.all_sprites.begin_step()
+        # Поле направлений пересчитывается, только когда игрок сменил клетку
+        if self.player:
+            self.flow_field.update(self.player.hitbox_rect.center)
+            self.lod.begin_step(self.player.rect.center)
+        self.all_sprites.update(dt)
+        if self.swarm:
+            self.swarm.update(dt)
+        self.bullet_collision()
+        self.enemy_attacks()
+        self.check_game_over()
+        self.spawn_boss(dt)
+
+        if self.player:
+            population = len(self.enemy_sprites) + (self.swarm.count if self.swarm else 0)
+            for enemy_type, pos in self.director.update(dt, self.player.rect.center, population):
+                self.spawn_enemy(enemy_type, pos)
+
+    def run_headless(self, steps, input_source=None, seed=None):
+        """Матч без окна и отрисовки - симуляция идёт так быстро, как позволяет CPU"""
+        self.init_game(seed, input_source)
+        self.state = GameState.PLAYING
+
+        step = 0
+        while step < steps and self.state == GameState.PLAYING:
+            self.update_world(self.sim_step)
+            self.hud.update()
+            step += 1
+        return step
+
+    def draw_world(self):
+        """Кадр игры без прицела: мир, полоски здоровья, эффекты оружия и HUD"""
+        self.display_surface.fill('black')
+        if self.player:
+            self.all_sprites.draw(self.all_sprites.interpolated_center(self.player, self.render_alpha),
+                                  self.render_alpha)
+            
+            # Отрисовка хитбоксов
+            # self.player.draw_hitbox(self.display_surface, self.all_sprites.offset)
+            # for enemy in self.enemy_sprites:
+            #     enemy.draw_hitbox(self.display_surface, self.all_sprites.offset)
+
+            # Полоски здоровья, урон и следы попаданий видимых врагов - одним пакетом
+            self.overlay.draw(self.display_surface, self.all_sprites, self.swarm, self.render_alpha)
+            
+            # Отрисовка эффектов оружия (при перегрузке пропускается)
+            if governor.extra_effects:
+                for sprite in self.all_sprites:
+                    if isinstance(sprite, WeaponItem):
+                        sprite.draw_effects(self.display_surface, self.all_sprites.offset)
+                
+                # Отрисовка области атаки меча (после всего остального)
+                if self.player and isinstance(self.player.current_weapon, Sword):
+                    self.player.current_weapon.draw_attack_area(self.display_surface)
+        
+        # Отрисовка HUD только во время игры
+        if self.player and self.hud:
+            self.hud.draw(self.display_surface)
+
+    def pause_snapshot(self):
+        """Один раз рисует последний кадр игры для фона меню паузы"""
+        self.draw_world()
+        snapshot = self.display_surface.copy()
+        if PAUSE_DIM:
+            snapshot.fill((255 - PAUSE_DIM,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+        self.pause_menu.set_snapshot(snapshot)
+
     def run(self):
+        # Состояние, нарисованное на экране в прошлом кадре
+        drawn_state = None
         while self.running:
-            dt = self.clock.tick() / 1000
+            # Долгий кадр (загрузка, перетаскивание окна) не разгоняет симуляцию
+            frame_cap = FRAME_CAP if self.state == GameState.PLAYING else MENU_FRAME_CAP
+            frame_time = min(self.clock.tick(frame_cap) / 1000, MAX_FRAME_TIME)
+            # Время работы прошлого кадра без ожидания - по нему регулируется нагрузка
+            if self.state == GameState.PLAYING:
+                governor.record(self.clock.get_rawtime())
 
             # Обработка событий
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
 
+                # Окно показано заново или изменилось - меню перерисовывается целиком
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED):
+                    drawn_state = None
+
                 # Пауза по ESC во время игры
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if self.state == GameState.PLAYING:
                             self.state = GameState.PAUSED
                             pygame.mouse.set_visible(True)
+                            # Мир под меню паузы не перерисовывается - кадр снимается один раз
+                            self.pause_snapshot()
                         elif self.state == GameState.PAUSED:
                             self.state = GameState.PLAYING
                             pygame.mouse.set_visible(False)
@@ -346,103 +548,111 @@ class Game:
                                 GameState.GAME_OVER, GameState.SETTINGS,
                                 GameState.GAME_PARAMS]:
                     self.handle_menu_events(event)
-                elif self.state == GameState.PLAYING:
-                    if event.type == self.enemy_event:
-                        self.spawn_enemies()
+
+            # Меню рисуются в кэш и обновляют на экране только изменившиеся области;
+            # после другого состояния экран меню собирается заново
+            menu = {GameState.MAIN_MENU: self.main_menu, GameState.GAME_PARAMS: self.game_params_menu,
+                    GameState.PAUSED: self.pause_menu, GameState.GAME_OVER: self.game_over_menu,
+                    GameState.SETTINGS: self.settings_menu}.get(self.state)
+            if menu and self.state != drawn_state:
+                menu.screen.invalidate()
+            drawn_state = self.state
+            dirty_rects = None
 
             # Обновление и отрисовка в зависимости от состояния игры
             if self.state == GameState.MAIN_MENU:
-                self.display_surface.fill('black')
-                self.main_menu.draw(self.display_surface)
+                dirty_rects = self.main_menu.render(self.display_surface)
             elif self.state == GameState.GAME_PARAMS:
-                self.display_surface.fill('black')
-                self.game_params_menu.draw(self.display_surface)
+                dirty_rects = self.game_params_menu.render(self.display_surface)
             elif self.state == GameState.PAUSED:
-                # Сначала рисуем игру
-                if self.player and self.all_sprites:
-                    self.display_surface.fill('black')
-                    self.all_sprites.draw(self.player.rect.center)
-                # Затем меню паузы поверх
-                self.pause_menu.draw(self.display_surface)
+                # Застывший кадр игры и меню паузы поверх него
+                dirty_rects = self.pause_menu.render(self.display_surface)
             elif self.state == GameState.GAME_OVER:
-                self.display_surface.fill('black')
-                self.game_over_menu.draw(self.display_surface, self.final_time, self.final_kills)
+                dirty_rects = self.game_over_menu.render(self.display_surface, self.final_time, self.final_kills)
             elif self.state == GameState.SETTINGS:
-                self.display_surface.fill('black')
-                self.settings_menu.draw(self.display_surface)
+                dirty_rects = self.settings_menu.render(self.display_surface)
             elif self.state == GameState.PLAYING:
-                # Обновление
-                self.all_sprites.update(dt)
-                self.bullet_collision()
-                self.enemy_attacks()
-                self.check_game_over()
-                self.spawn_boss()
-
-                # Отрисовка
-                self.display_surface.fill('black')
-                if self.player:
-                    self.all_sprites.draw(self.player.rect.center)
-                    
-                    # Отрисовка хитбоксов
-                    # self.player.draw_hitbox(self.display_surface, self.all_sprites.offset)
-                    for enemy in self.enemy_sprites:
-                    #     enemy.draw_hitbox(self.display_surface, self.all_sprites.offset)
-                        enemy.draw_hp_bar(self.display_surface, self.all_sprites.offset)
-                    
-                    # Отрисовка эффектов оружия
-                    for sprite in self.all_sprites:
-                        if isinstance(sprite, WeaponItem):
-                            sprite.draw_effects(self.display_surface, self.all_sprites.offset)
-                    
-                    # Отрисовка области атаки меча (после всего остального)
-                    if self.player and isinstance(self.player.current_weapon, Sword):
-                        self.player.current_weapon.draw_attack_area(self.display_surface)
-                
-                # Отрисовка HUD только во время игры
-                if self.player and self.hud:
-                    self.hud.draw(self.display_surface)
+                # Обновление: столько фиксированных шагов, сколько накопилось времени
+                # При ускорении за кадр выполняется больше шагов той же длины
+                self.accumulator += frame_time * game_clock.time_scale
+                while self.accumulator >= self.sim_step and self.state == GameState.PLAYING:
+                    self.update_world(self.sim_step)
+                    self.accumulator -= self.sim_step
+                self.render_alpha = self.accumulator / self.sim_step
+
+                # Отрисовка между двумя последними состояниями симуляции
+                self.draw_world()
 
                 # crosshair
                 if not pygame.mouse.get_visible():
                     crosshair_rect = self.crosshair_image.get_rect(center = pygame.mouse.get_pos())
                     self.display_surface.blit(self.crosshair_image, crosshair_rect)
 
-            pygame.display.update()
+            if dirty_rects is None:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
         
+        # Матч, прерванный закрытием окна, тоже сохраняется
+        if self.state in (GameState.PLAYING, GameState.PAUSED):
+            self.save_replay()
         pygame.quit()
 
-    def spawn_enemies(self):
-        """Спавн обычных врагов"""
-        if self.spawn_positions and self.enemy_frames:
-            # Проверяем шанс спавна в зависимости от сложности
-            if random.random() > self.difficulty_multipliers[self.difficulty]['spawn_rate']:
-                return
-                
-            pos = choice(self.spawn_positions)
-            # Выбираем случайный тип врага, кроме босса
-            available_frames = {k: v for k, v in self.enemy_frames.items() if k != 'Boss'}
-            if available_frames:
-                # print(f"Доступные типы врагов: {list(available_frames.keys())}")  # Отладочная информация
-                enemy_type = choice(list(available_frames.keys()))
-                frames = available_frames[enemy_type]
-                # print(f"Создаем врага типа: {enemy_type}")  # Отладочная информация
-                
-                # Создаем врага соответствующего типа
-                if enemy_type == 'bat':
-                    enemy = Bat(pos, frames, [self.all_sprites, self.enemy_sprites], self.player, self.collision_sprites)
-                    # print(f"Создана летучая мышь: скорость={enemy.speed}, здоровье={enemy.health}, урон={enemy.damage}")
-                elif enemy_type == 'blob':
-                    enemy = Slime(pos, frames, [self.all_sprites, self.enemy_sprites], self.player, self.collision_sprites)
-                    # print(f"Создан слизень: скорость={enemy.speed}, здоровье={enemy.health}, урон={enemy.damage}")
-                else:  # skeleton или любой другой тип
-                    enemy = Skeleton(pos, frames, [self.all_sprites, self.enemy_sprites], self.player, self.collision_sprites)
-                    # print(f"Создан скелет: скорость={enemy.speed}, здоровье={enemy.health}, урон={enemy.damage}")
-                
-                # Применяем множители сложности
-                enemy.health = int(enemy.health * self.difficulty_multipliers[self.difficulty]['health'])
-                enemy.max_health = enemy.health
-                enemy.damage = int(enemy.damage * self.difficulty_multipliers[self.difficulty]['damage'])
+    def spawn_enemy(self, enemy_type, pos):
+        """Создаёт обычного врага выбранного директором типа"""
+        multipliers = self.difficulty_multipliers[self.difficulty]
+
+        # Обычные враги уходят в рой, если он включён
+        if self.swarm:
+            self.swarm.spawn(enemy_type, pos, multipliers['health'], multipliers['damage'])
+            return
+
+        enemy_class = ENEMY_CLASSES.get(enemy_type, Skeleton)  # skeleton или любой другой тип
+        enemy = enemy_class(pos, self.enemy_frames[enemy_type], [self.all_sprites, self.enemy_sprites],
+                            self.player, self.collision_sprites)
+
+        # Применяем множители сложности
+        enemy.health = int(enemy.health * multipliers['health'])
+        enemy.max_health = enemy.health
+        enemy.damage = int(enemy.damage * multipliers['damage'])
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true', help='прогон матча без окна и отрисовки')
+    parser.add_argument('--steps', type=int, default=SIM_RATE * 300, help='число шагов симуляции без окна')
+    parser.add_argument('--map', type=int, default=0)
+    parser.add_argument('--difficulty', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--replay', help='воспроизвести записанный матч без окна')
+    parser.add_argument('--speed', type=float, default=1.0, help='скорость игрового времени в окне')
+    parser.add_argument('--verbose', action='store_true', help='печатать смену ступеней нагрузки')
+    args = parser.parse_args()
+    governor.verbose = args.verbose
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        game = Game(headless=True)
+        game.selected_map = replay.map_index
+        game.difficulty = replay.difficulty
+        game.use_swarm = replay.use_swarm
+        game.sim_step = 1 / replay.sim_rate
+        start = time.perf_counter()
+        steps = game.run_headless(replay.frame_count, ReplayInput(replay), replay.seed)
+        elapsed = time.perf_counter() - start
+        print(f"Реплей: {steps} шагов ({steps / replay.sim_rate:.1f} с игры) за {elapsed:.2f} с, "
+              f"убийств: {game.hud.kills}, врагов: {len(game.enemy_sprites)}, состояние: {game.state.name}")
+        pygame.quit()
+    elif args.headless:
+        game = Game(headless=True)
+        game.selected_map = args.map
+        game.difficulty = args.difficulty
+        start = time.perf_counter()
+        steps = game.run_headless(args.steps, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"Шагов: {steps} ({steps / SIM_RATE:.1f} с игры) за {elapsed:.2f} с, "
+              f"убийств: {game.hud.kills}, врагов: {len(game.enemy_sprites)}, состояние: {game.state.name}")
+        pygame.quit()
+    else:
+        game_clock.time_scale = args.speed
+        game = Game()
+        game.run()
\ No newline at end of file
@@ -1,5 +1,12 @@
 from .base_sprite import Sprite
 from .collision_sprite import CollisionSprite
-from .groups import AllSprites
+from .groups import (
+    AllSprites, CollisionSprites, LAYER_GROUND, LAYER_OBJECTS, LAYER_ENTITIES, LAYER_EFFECTS, LAYER_OVERLAY
+)
+from .ground import GroundLayer
+from .spatial import SpatialGrid
 
-__all__ = ['Sprite', 'CollisionSprite', 'AllSprites'] 
\ No newline at end of file
+__all__ = [
+    'Sprite', 'CollisionSprite', 'AllSprites', 'CollisionSprites', 'GroundLayer', 'SpatialGrid',
+    'LAYER_GROUND', 'LAYER_OBJECTS', 'LAYER_ENTITIES', 'LAYER_EFFECTS', 'LAYER_OVERLAY'
+] 
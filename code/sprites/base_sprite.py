@@ -5,4 +5,5 @@ class Sprite(pygame.sprite.Sprite):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_frect(topleft=pos)
-        self.ground = True 
\ No newline at end of file
+        self.ground = True
+        self.static = True 
\ No newline at end of file
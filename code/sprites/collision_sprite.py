@@ -4,4 +4,5 @@ class CollisionSprite(pygame.sprite.Sprite):
     def __init__(self, pos, surf, groups):
         super().__init__(groups)
         self.image = surf
-        self.rect = self.image.get_frect(topleft=pos) 
\ No newline at end of file
+        self.rect = self.image.get_frect(topleft=pos)
+        self.static = True 
\ No newline at end of file
@@ -0,0 +1,43 @@
+import pygame
+
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE
+
+
+class GroundLayer:
+    """Слой земли, заранее запечённый в чанки фиксированного размера"""
+
+    def __init__(self, tiles, chunk_tiles=8):
+        # Размер чанка в пикселях (по умолчанию 8x8 тайлов = 512x512)
+        self.chunk_size = chunk_tiles * TILE_SIZE
+        self.chunks = {}
+
+        # Сортируем тайлы так же, как раньше сортировались спрайты земли
+        placed = []
+        for x, y, surf in tiles:
+            rect = surf.get_frect(topleft=(x * TILE_SIZE, y * TILE_SIZE))
+            placed.append((rect, surf))
+        placed.sort(key=lambda item: item[0].centery)
+
+        for rect, surf in placed:
+            # Тайл может быть больше клетки - рисуем его во все чанки, которые он задевает
+            for cx in range(int(rect.left) // self.chunk_size, int(rect.right - 1) // self.chunk_size + 1):
+                for cy in range(int(rect.top) // self.chunk_size, int(rect.bottom - 1) // self.chunk_size + 1):
+                    chunk = self.chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = pygame.Surface((self.chunk_size, self.chunk_size)).convert()
+                        chunk.fill('black')
+                        self.chunks[(cx, cy)] = chunk
+                    chunk.blit(surf, (rect.x - cx * self.chunk_size, rect.y - cy * self.chunk_size))
+
+    def draw(self, surface, offset):
+        """Рисует только те чанки, которые попадают в камеру"""
+        left = int(-offset.x) // self.chunk_size
+        top = int(-offset.y) // self.chunk_size
+        right = int(-offset.x + WINDOW_WIDTH) // self.chunk_size
+        bottom = int(-offset.y + WINDOW_HEIGHT) // self.chunk_size
+
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    surface.blit(chunk, (cx * self.chunk_size + offset.x, cy * self.chunk_size + offset.y))
@@ -1,6 +1,27 @@
+from heapq import merge
+from itertools import count
+
 import pygame
 
-from core import WINDOW_HEIGHT, WINDOW_WIDTH
+from core import WINDOW_HEIGHT, WINDOW_WIDTH, TILE_SIZE
+from .spatial import SpatialGrid
+
+# Слои отрисовки (спрайт может задать свой через атрибут render_layer)
+LAYER_GROUND, LAYER_OBJECTS, LAYER_ENTITIES, LAYER_EFFECTS, LAYER_OVERLAY = range(5)
+
+# Проходы отрисовки: объекты и сущности сортируются по глубине вместе,
+# чтобы игрок мог заходить за деревья
+RENDER_PASSES = (
+    (LAYER_GROUND,),
+    (LAYER_OBJECTS, LAYER_ENTITIES),
+    (LAYER_EFFECTS,),
+    (LAYER_OVERLAY,),
+)
+PASS_OF_LAYER = {layer: index for index, layer_group in enumerate(RENDER_PASSES) for layer in layer_group}
+
+
+def depth_key(sprite):
+    return sprite.rect.centery
 
 
 class AllSprites(pygame.sprite.Group):
@@ -8,14 +29,234 @@ class AllSprites(pygame.sprite.Group):
         super().__init__()
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.Vector2()
-    
-    def draw(self, target_pos):
+        # Запечённый слой земли (GroundLayer), задаётся при загрузке карты
+        self.ground_layer = None
+        # Роевой движок врагов (Swarm) - рисуется вместе с сущностями
+        self.swarm = None
+        # Пул пуль (BulletPool) - рисуется одним пакетом в проходе эффектов
+        self.bullets = None
+
+        # Пространственный индекс: статичные спрайты кладутся один раз,
+        # движущиеся перекладываются только при смене клетки
+        self.grid = SpatialGrid(TILE_SIZE * 4)
+        self.pending_sprites = {}
+        self.moving_sprites = {}
+        self.view_margin = TILE_SIZE * 2
+        self.view_rect = pygame.FRect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        # Спрайты, попавшие в камеру на последней отрисовке (для слоя поверх мира)
+        self.visible = set()
+
+        # Порядок добавления - для стабильной сортировки при равном centery
+        self.order = {}
+        self.order_counter = count()
+
+        # Порядок отрисовки: статичные спрайты сортируются один раз (rank),
+        # движущиеся хранятся почти отсортированными между кадрами
+        self.render_pass = {}
+        self.static_rank = {}
+        self.static_dirty = False
+        self.moving_order = [[] for _ in RENDER_PASSES]
+        self.moving_dirty = False
+
+        # Позиции движущихся спрайтов до последнего шага симуляции - для интерполяции
+        self.previous = {}
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.order[sprite] = next(self.order_counter)
+        # rect у спрайта появляется уже после super().__init__(groups),
+        # поэтому в индекс он попадает при следующей отрисовке
+        self.pending_sprites[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.order.pop(sprite, None)
+        self.pending_sprites.pop(sprite, None)
+        self.grid.remove(sprite)
+        self.static_rank.pop(sprite, None)
+        if sprite in self.moving_sprites:
+            del self.moving_sprites[sprite]
+            self.moving_dirty = True
+        self.previous.pop(sprite, None)
+        self.render_pass.pop(sprite, None)
+
+    def get_render_layer(self, sprite):
+        """Слой спрайта определяется один раз при добавлении"""
+        layer = getattr(sprite, 'render_layer', None)
+        if layer is not None:
+            return layer
+        if hasattr(sprite, 'ground'):
+            return LAYER_GROUND
+        if getattr(sprite, 'static', False):
+            return LAYER_OBJECTS
+        return LAYER_ENTITIES
+
+    def index_pending(self):
+        for sprite in self.pending_sprites:
+            self.grid.insert(sprite, sprite.rect)
+            render_pass = PASS_OF_LAYER[self.get_render_layer(sprite)]
+            self.render_pass[sprite] = render_pass
+            if getattr(sprite, 'static', False):
+                self.static_rank[sprite] = None
+                self.static_dirty = True
+            else:
+                self.moving_sprites[sprite] = None
+                self.moving_order[render_pass].append(sprite)
+        self.pending_sprites.clear()
+
+        # Статичные спрайты пересортировываются только после загрузки новых
+        if self.static_dirty:
+            ranked = sorted(self.static_rank, key=lambda sprite: (sprite.rect.centery, self.order[sprite]))
+            self.static_rank = {sprite: rank for rank, sprite in enumerate(ranked)}
+            self.static_dirty = False
+
+        if self.moving_dirty:
+            self.moving_order = [[sprite for sprite in layer if sprite in self.moving_sprites]
+                                 for layer in self.moving_order]
+            self.moving_dirty = False
+
+    def sort_moving(self):
+        """Проход вставками по порядку прошлого кадра - почти линейный, если мало кто сменил ряд"""
+        for sprites in self.moving_order:
+            keys = [sprite.rect.centery for sprite in sprites]
+            for i in range(1, len(sprites)):
+                key = keys[i]
+                if keys[i - 1] <= key:
+                    continue
+                sprite = sprites[i]
+                j = i - 1
+                while j >= 0 and keys[j] > key:
+                    keys[j + 1] = keys[j]
+                    sprites[j + 1] = sprites[j]
+                    j -= 1
+                keys[j + 1] = key
+                sprites[j + 1] = sprite
+
+    def begin_step(self):
+        """Запоминает позиции перед шагом симуляции"""
+        previous = self.previous
+        for sprite in self.moving_sprites:
+            previous[sprite] = (sprite.rect.x, sprite.rect.y)
+        if self.swarm:
+            self.swarm.begin_step()
+        if self.bullets is not None:
+            self.bullets.begin_step()
+
+    def interpolated_center(self, sprite, alpha):
+        """Центр спрайта между двумя последними шагами симуляции"""
+        previous = self.previous.get(sprite)
+        if previous is None:
+            return sprite.rect.center
+        x = previous[0] + (sprite.rect.x - previous[0]) * alpha
+        y = previous[1] + (sprite.rect.y - previous[1]) * alpha
+        return x + sprite.rect.width / 2, y + sprite.rect.height / 2
+
+    def visible_sprites(self):
+        """Спрайты, попадающие в камеру (с запасом по краям)"""
+        for sprite in self.moving_sprites:
+            self.grid.move(sprite, sprite.rect)
+
+        self.view_rect.topleft = (-self.offset.x, -self.offset.y)
+        return self.grid.query(self.view_rect.inflate(self.view_margin * 2, self.view_margin * 2))
+
+    def draw(self, target_pos, alpha=1.0):
         self.offset.x = -(target_pos[0] - WINDOW_WIDTH / 2)
         self.offset.y = -(target_pos[1] - WINDOW_HEIGHT / 2)
 
-        ground_sprites = [sprite for sprite in self if hasattr(sprite, 'ground')] 
-        object_sprites = [sprite for sprite in self if not hasattr(sprite, 'ground')] 
-        
-        for layer in [ground_sprites, object_sprites]:
-            for sprite in sorted(layer, key = lambda sprite: sprite.rect.centery):
-                self.display_surface.blit(sprite.image, sprite.rect.topleft + self.offset)
\ No newline at end of file
+        if self.ground_layer:
+            self.ground_layer.draw(self.display_surface, self.offset)
+
+        self.index_pending()
+        self.sort_moving()
+        visible = self.visible_sprites()
+        self.visible = visible
+
+        static_visible = [[] for _ in RENDER_PASSES]
+        for sprite in visible:
+            if sprite in self.static_rank:
+                static_visible[self.render_pass[sprite]].append(sprite)
+
+        swarm_pass = PASS_OF_LAYER[LAYER_ENTITIES]
+        bullet_pass = PASS_OF_LAYER[LAYER_EFFECTS]
+        for render_pass, moving in enumerate(self.moving_order):
+            statics = sorted(static_visible[render_pass], key=self.static_rank.__getitem__)
+            movers = [sprite for sprite in moving if sprite in visible]
+            swarm_views = []
+            if self.swarm and render_pass == swarm_pass:
+                swarm_views = self.swarm.visible_views(self.view_rect.inflate(self.view_margin * 2, self.view_margin * 2), alpha)
+            for sprite in merge(statics, movers, swarm_views, key=depth_key):
+                previous = self.previous.get(sprite)
+                if previous is None:
+                    self.display_surface.blit(sprite.image, sprite.rect.topleft + self.offset)
+                else:
+                    # Между шагами симуляции спрайт рисуется в промежуточной позиции
+                    x = previous[0] + (sprite.rect.x - previous[0]) * alpha
+                    y = previous[1] + (sprite.rect.y - previous[1]) * alpha
+                    self.display_surface.blit(sprite.image, (x + self.offset.x, y + self.offset.y))
+            if self.bullets is not None and render_pass == bullet_pass:
+                self.bullets.draw(self.display_surface, self.offset, self.view_rect, alpha)
+
+
+class CollisionSprites(pygame.sprite.Group):
+    """Статичные коллайдеры карты с сеткой для быстрого поиска соседей"""
+
+    def __init__(self, cell_size=TILE_SIZE * 2):
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = []
+        self.dirty = True
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.dirty = True
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.dirty = True
+
+    def build_grid(self):
+        """Раскладывает коллайдеры по клеткам в порядке группы"""
+        self.cells = {}
+        self.rects = [sprite.rect for sprite in self]
+        size = self.cell_size
+        for index, rect in enumerate(self.rects):
+            for cx in range(int(rect.left // size), int(rect.right // size) + 1):
+                for cy in range(int(rect.top // size), int(rect.bottom // size) + 1):
+                    self.cells.setdefault((cx, cy), []).append(index)
+        self.dirty = False
+
+    def query(self, rect, after=-1):
+        """Индексы коллайдеров из клеток под rect (в порядке группы, больше after)"""
+        if self.dirty:
+            self.build_grid()
+        size = self.cell_size
+        found = set()
+        for cx in range(int(rect.left // size), int(rect.right // size) + 1):
+            for cy in range(int(rect.top // size), int(rect.bottom // size) + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return sorted(index for index in found if index > after)
+
+    def resolve(self, hitbox, axis, direction):
+        """Выталкивает hitbox из коллайдеров по одной оси - так же, как полный перебор группы"""
+        candidates = self.query(hitbox)
+        i = 0
+        while i < len(candidates):
+            index = candidates[i]
+            rect = self.rects[index]
+            if rect.colliderect(hitbox):
+                if axis == 'horizontal':
+                    if direction.x > 0:
+                        hitbox.right = rect.left
+                    if direction.x < 0:
+                        hitbox.left = rect.right
+                else:
+                    if direction.y < 0:
+                        hitbox.top = rect.bottom
+                    if direction.y > 0:
+                        hitbox.bottom = rect.top
+                # hitbox сдвинулся - оставшихся кандидатов ищем уже вокруг нового положения
+                candidates = candidates[:i + 1] + self.query(hitbox, after=index)
+            i += 1
@@ -0,0 +1,59 @@
+class SpatialGrid:
+    """Равномерная сетка для быстрого поиска объектов по прямоугольнику"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {объект: None}
+        self.keys = {}   # объект -> диапазон клеток (x0, y0, x1, y1)
+
+    def cell_range(self, rect):
+        """Диапазон клеток, которые задевает прямоугольник"""
+        size = self.cell_size
+        return (int(rect.left // size), int(rect.top // size),
+                int(rect.right // size), int(rect.bottom // size))
+
+    def insert(self, item, rect):
+        key = self.cell_range(rect)
+        self.keys[item] = key
+        x0, y0, x1, y1 = key
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), {})[item] = None
+
+    def remove(self, item):
+        key = self.keys.pop(item, None)
+        if key is None:
+            return
+        x0, y0, x1, y1 = key
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    cell.pop(item, None)
+                    if not cell:
+                        del self.cells[(cx, cy)]
+
+    def move(self, item, rect):
+        """Перекладывает объект только если он сменил клетку"""
+        if self.keys.get(item) == self.cell_range(rect):
+            return
+        self.remove(item)
+        self.insert(item, rect)
+
+    def query(self, rect):
+        """Все объекты из клеток, которые задевает прямоугольник"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found.keys()
+
+    def clear(self):
+        self.cells.clear()
+        self.keys.clear()
+
+    def __contains__(self, item):
+        return item in self.keys
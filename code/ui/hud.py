@@ -1,7 +1,7 @@
 import pygame
 from os.path import join
 
-from core import WINDOW_WIDTH, WINDOW_HEIGHT
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, game_clock, governor, text_cache
 
 
 class HUD:
@@ -20,13 +20,14 @@ class HUD:
         self.empty_color = (60, 60, 60)
         self.exp_color = (0, 200, 0)  # Зеленый цвет для полоски опыта
 
-        self.font = pygame.font.Font(None, 24)
-        self.timer_font = pygame.font.Font(None, 36)  # Больший шрифт для таймера
-        self.boss_font = pygame.font.Font(None, 48)  # Ещё больший шрифт для босса
-        self.level_font = pygame.font.Font(None, 32)  # Шрифт для уровня
+        # Размеры шрифтов; сами шрифты и готовые надписи хранит text_cache
+        self.font_size = 24
+        self.timer_font_size = 36  # Больший шрифт для таймера
+        self.boss_font_size = 48  # Ещё больший шрифт для босса
+        self.level_font_size = 32  # Шрифт для уровня
 
         # Время начала игры
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.ticks()
         self.game_time = 0  # Текущее время игры
 
         # Счетчик убийств
@@ -44,13 +45,16 @@ class HUD:
             'Sword': 'Меч',
             'AutoRifle': 'Автомат'
         }
+
+        # Готовые поверхности виджетов: имя -> (наблюдаемое значение, поверхность, позиция)
+        self.widgets = {}
         # print("HUD инициализирован, kills =", self.kills)  # Отладка
 
     def update(self):
         """Обновляем время игры"""
         if not self.player or not self.player.alive:
             return
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.ticks()
         self.game_time = (current_time - self.start_time) // 1000
 
     def get_survival_time(self):
@@ -70,19 +74,23 @@ class HUD:
 
     def reset(self):
         """Сбрасывает таймер и счетчик убийств"""
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.ticks()
         self.game_time = 0
         self.kills = 0
 
-    def draw_weapon_slots(self, surface):
-        if not self.player or not hasattr(self.player, 'weapons'):
-            return
+    def widget(self, name, state, build, surface):
+        """Готовая поверхность виджета - пересобирается, только если изменилось наблюдаемое значение"""
+        cached = self.widgets.get(name)
+        if cached is None or cached[0] != state:
+            cached = (state,) + build(surface)
+            self.widgets[name] = cached
+        return cached[1], cached[2]
 
-        # Рисуем слоты для оружия внизу экрана
+    def build_weapon_slots(self, surface):
+        # Слоты для оружия внизу экрана
         center_x = surface.get_width() // 2
-        start_x = center_x - (self.weapon_slot_size * 1.5 + self.weapon_slot_gap)
 
-        # Фон для всех слотов
+        # Фон для всех слотов - он же размер виджета
         slots_bg_width = (self.weapon_slot_size * 3) + (self.weapon_slot_gap * 2) + 10
         slots_bg_height = self.weapon_slot_size + 10
         slots_bg_rect = pygame.Rect(
@@ -91,158 +99,175 @@ class HUD:
             slots_bg_width,
             slots_bg_height
         )
-        pygame.draw.rect(surface, (20, 20, 20), slots_bg_rect)
-        pygame.draw.rect(surface, (40, 40, 40), slots_bg_rect, 1)
+        widget = pygame.Surface(slots_bg_rect.size)
+        widget.fill((20, 20, 20))
+        pygame.draw.rect(widget, (40, 40, 40), widget.get_rect(), 1)
 
+        start_x = center_x - (self.weapon_slot_size * 1.5 + self.weapon_slot_gap) - slots_bg_rect.x
         for i in range(3):
             slot_x = start_x + i * (self.weapon_slot_size + self.weapon_slot_gap)
-            slot_rect = pygame.Rect(slot_x, self.weapon_slots_y, self.weapon_slot_size, self.weapon_slot_size)
+            slot_rect = pygame.Rect(slot_x, 5, self.weapon_slot_size, self.weapon_slot_size)
             
             # Рисуем фон слота
-            pygame.draw.rect(surface, (30, 30, 30), slot_rect)
-            pygame.draw.rect(surface, (60, 60, 60), slot_rect, 1)
+            pygame.draw.rect(widget, (30, 30, 30), slot_rect)
+            pygame.draw.rect(widget, (60, 60, 60), slot_rect, 1)
 
             # Если есть оружие в этом слоте
             if i < len(self.player.weapons):
-                # Рисуем иконку оружия
+                # Рисуем иконку оружия (масштабируется только при смене инвентаря)
                 weapon = self.player.weapons[i]
                 if hasattr(weapon, 'weapon_surf'):
                     weapon_image = pygame.transform.scale(weapon.weapon_surf, (36, 36))
                     image_rect = weapon_image.get_rect(center=slot_rect.center)
-                    surface.blit(weapon_image, image_rect)
+                    widget.blit(weapon_image, image_rect)
 
             # Если это активное оружие
             if hasattr(self.player, 'current_weapon_index') and i == self.player.current_weapon_index:
-                pygame.draw.rect(surface, (200, 200, 0), slot_rect, 2)
+                pygame.draw.rect(widget, (200, 200, 0), slot_rect, 2)
 
-    def draw_boss_timer(self, surface):
-        if self.time_until_boss > 0:
-            # Текст для таймера босса
-            boss_text = f"Босс через: {self.time_until_boss}"
-            boss_surface = self.timer_font.render(boss_text, True, (255, 50, 50, 128))  # Уменьшили непрозрачность
+        return widget, slots_bg_rect.topleft
 
-            # Размещаем в правом верхнем углу
-            boss_x = surface.get_width() - boss_surface.get_width() - 20
-            boss_y = 60
+    def build_boss_timer(self, surface):
+        # Текст для таймера босса
+        boss_text = f"Босс через: {self.time_until_boss}"
+        boss_surface = text_cache.render(boss_text, self.timer_font_size, (255, 50, 50, 128))  # Уменьшили непрозрачность
 
-            # Фон для текста
-            boss_bg = pygame.Rect(boss_x - 10, boss_y - 5,
-                                boss_surface.get_width() + 20,
-                                boss_surface.get_height() + 10)
-            pygame.draw.rect(surface, (0, 0, 0, 64), boss_bg)  # Сделали фон более прозрачным
-            pygame.draw.rect(surface, (255, 0, 0, 64), boss_bg, 1)  # Уменьшили толщину рамки и сделали её прозрачной
+        # Размещаем в правом верхнем углу
+        boss_x = surface.get_width() - boss_surface.get_width() - 20
+        boss_y = 60
 
-            surface.blit(boss_surface, (boss_x, boss_y))
+        # Фон для текста
+        widget = pygame.Surface((boss_surface.get_width() + 20, boss_surface.get_height() + 10))
+        pygame.draw.rect(widget, (0, 0, 0, 64), widget.get_rect())  # Сделали фон более прозрачным
+        pygame.draw.rect(widget, (255, 0, 0, 64), widget.get_rect(), 1)  # Уменьшили толщину рамки и сделали её прозрачной
 
-    def draw_survival_time(self, surface):
-        """Отрисовка времени выживания"""
-        self.update()  # Обновляем время
+        widget.blit(boss_surface, (10, 5))
+        return widget, (boss_x - 10, boss_y - 5)
+
+    def build_survival_time(self, surface):
+        """Виджет времени выживания"""
         time_text = self.format_time(self.game_time)
-        timer_surface = self.timer_font.render(time_text, True, (255, 255, 255))
+        timer_surface = text_cache.render(time_text, self.timer_font_size, (255, 255, 255))
 
         # Центрируем по горизонтали
         timer_x = (surface.get_width() - timer_surface.get_width()) // 2
         timer_y = 15  # Небольшой отступ сверху
 
         # Добавляем фон для лучшей читаемости
-        timer_bg = pygame.Rect(timer_x - 10, timer_y - 5,
-                            timer_surface.get_width() + 20,
-                            timer_surface.get_height() + 10)
-        pygame.draw.rect(surface, (0, 0, 0, 128), timer_bg)  # Полупрозрачный фон
-        pygame.draw.rect(surface, (60, 60, 60), timer_bg, 2)  # Рамка
+        widget = pygame.Surface((timer_surface.get_width() + 20, timer_surface.get_height() + 10))
+        pygame.draw.rect(widget, (0, 0, 0, 128), widget.get_rect())  # Полупрозрачный фон
+        pygame.draw.rect(widget, (60, 60, 60), widget.get_rect(), 2)  # Рамка
 
-        surface.blit(timer_surface, (timer_x, timer_y))
+        widget.blit(timer_surface, (10, 5))
+        return widget, (timer_x - 10, timer_y - 5)
 
     def draw(self, surface):
         if not self.player:
             return
 
-        # Рисуем полоску здоровья
-        self.draw_health_bar(surface)
-        
-        # Рисуем полоску опыта
-        self.draw_experience_bar(surface)
-        
-        # Рисуем уровень
-        self.draw_level(surface)
-
-        # Рисуем время
-        self.draw_time(surface)
+        self.update()  # Обновляем время
+        player = self.player
+        widgets = [
+            # Полоска здоровья
+            self.widget('health', (player.health, player.max_health), self.build_health_bar, surface),
+            # Полоска опыта
+            self.widget('experience', (player.experience, player.experience_to_next_level),
+                        self.build_experience_bar, surface),
+            # Уровень
+            self.widget('level', player.level, self.build_level, surface),
+            # Время
+            self.widget('time', self.game_time, self.build_survival_time, surface),
+            # Счетчик убийств
+            self.widget('kills', self.kills, self.build_kills, surface),
+        ]
+
+        # Время до босса
+        if self.time_until_boss > 0:
+            widgets.append(self.widget('boss', self.time_until_boss, self.build_boss_timer, surface))
 
-        # Рисуем счетчик убийств
-        self.draw_kills(surface)
+        # Инвентарь оружия
+        widgets.append(self.widget('weapons', (tuple(player.weapons), getattr(player, 'current_weapon_index', None)),
+                                   self.build_weapon_slots, surface))
 
-        # Рисуем время до босса
-        self.draw_boss_timer(surface)
+        # Сообщаем, что часть эффектов отключена из-за нагрузки
+        if governor.level > 0:
+            widgets.append(self.widget('governor', governor.level, self.build_governor_status, surface))
 
-        # Рисуем инвентарь оружия
-        self.draw_weapon_slots(surface)
+        # Кадр HUD - несколько готовых поверхностей одним вызовом
+        surface.blits(widgets, False)
 
-    def draw_health_bar(self, surface):
-        # Рисуем полоску здоровья
+    def build_health_bar(self, surface):
+        # Полоска здоровья
         bar_width = 200
         bar_height = 20
-        bar_x = self.x
-        bar_y = self.y
+
+        # Текст здоровья
+        health_text = f"HP: {self.player.health}/{self.player.max_health}"
+        text_surf = text_cache.render(health_text, self.font_size, (0, 0, 0))  # Черный цвет
+
+        widget = pygame.Surface((bar_width + 10 + text_surf.get_width(),
+                                 max(bar_height, text_surf.get_height())), pygame.SRCALPHA)
         
         # Фон полоски
-        pygame.draw.rect(surface, self.bg_color, (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(widget, self.bg_color, (0, 0, bar_width, bar_height))
         
         # Заполненная часть
         health_percent = self.player.health / self.player.max_health
         filled_width = int(bar_width * health_percent)
-        pygame.draw.rect(surface, self.filled_color, (bar_x, bar_y, filled_width, bar_height))
+        pygame.draw.rect(widget, self.filled_color, (0, 0, filled_width, bar_height))
         
-        # Текст здоровья
-        health_text = f"HP: {self.player.health}/{self.player.max_health}"
-        text_surf = self.font.render(health_text, True, (0, 0, 0))  # Черный цвет
-        surface.blit(text_surf, (bar_x + bar_width + 10, bar_y))
+        widget.blit(text_surf, (bar_width + 10, 0))
+        return widget, (self.x, self.y)
 
-    def draw_experience_bar(self, surface):
-        # Рисуем полоску опыта под полоской здоровья
+    def build_experience_bar(self, surface):
+        # Полоска опыта под полоской здоровья
         bar_width = 200
         bar_height = 10
-        bar_x = self.x
-        bar_y = self.y + 25  # Под полоской здоровья
+
+        # Текст опыта
+        exp_text = f"XP: {self.player.experience}/{self.player.experience_to_next_level}"
+        text_surf = text_cache.render(exp_text, self.font_size, (0, 0, 0))  # Черный цвет
+
+        widget = pygame.Surface((bar_width + 10 + text_surf.get_width(),
+                                 max(bar_height, text_surf.get_height())), pygame.SRCALPHA)
         
         # Фон полоски
-        pygame.draw.rect(surface, self.bg_color, (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(widget, self.bg_color, (0, 0, bar_width, bar_height))
         
         # Заполненная часть
         exp_percent = self.player.experience / self.player.experience_to_next_level
         filled_width = int(bar_width * exp_percent)
-        pygame.draw.rect(surface, self.exp_color, (bar_x, bar_y, filled_width, bar_height))
+        pygame.draw.rect(widget, self.exp_color, (0, 0, filled_width, bar_height))
         
-        # Текст опыта
-        exp_text = f"XP: {self.player.experience}/{self.player.experience_to_next_level}"
-        text_surf = self.font.render(exp_text, True, (0, 0, 0))  # Черный цвет
-        surface.blit(text_surf, (bar_x + bar_width + 10, bar_y))
+        widget.blit(text_surf, (bar_width + 10, 0))
+        return widget, (self.x, self.y + 25)  # Под полоской здоровья
 
-    def draw_level(self, surface):
-        # Рисуем уровень в левом краю экрана под полоской опыта
+    def build_level(self, surface):
+        # Уровень в левом краю экрана под полоской опыта
         level_text = f"LVL {self.player.level}"
-        text_surf = self.level_font.render(level_text, True, (0, 0, 0))  # Черный цвет
+        text_surf = text_cache.render(level_text, self.level_font_size, (0, 0, 0))  # Черный цвет
         # Размещаем текст по левому краю экрана
         text_x = 10  # Отступ от левого края
         text_y = self.y + 40  # Под полоской опыта
-        surface.blit(text_surf, (text_x, text_y))
+        return text_surf, (text_x, text_y)
 
-    def draw_time(self, surface):
-        self.draw_survival_time(surface)
+    def build_governor_status(self, surface):
+        status_surface = text_cache.render(f"Упрощение: {governor.describe()}", self.font_size, (150, 150, 150))
+        return status_surface, (surface.get_width() - status_surface.get_width() - 15,
+                                surface.get_height() - status_surface.get_height() - 10)
 
-    def draw_kills(self, surface):
+    def build_kills(self, surface):
         # Счетчик убийств в правом верхнем углу
         kills_text = f"Kills: {self.kills}"
-        kills_surface = self.font.render(kills_text, True, (255, 255, 0))  # Желтый цвет
+        kills_surface = text_cache.render(kills_text, self.font_size, (255, 255, 0))  # Желтый цвет
 
         kills_x = surface.get_width() - kills_surface.get_width() - 15
         kills_y = 15
 
         # Фон для счетчика убийств
-        kills_bg = pygame.Rect(kills_x - 10, kills_y - 5,
-                               kills_surface.get_width() + 20,
-                               kills_surface.get_height() + 10)
-        pygame.draw.rect(surface, (0, 0, 0, 128), kills_bg)
-        pygame.draw.rect(surface, (60, 60, 60), kills_bg, 2)
+        widget = pygame.Surface((kills_surface.get_width() + 20, kills_surface.get_height() + 10))
+        pygame.draw.rect(widget, (0, 0, 0, 128), widget.get_rect())
+        pygame.draw.rect(widget, (60, 60, 60), widget.get_rect(), 2)
 
-        surface.blit(kills_surface, (kills_x, kills_y))
\ No newline at end of file
+        widget.blit(kills_surface, (10, 5))
+        return widget, (kills_x - 10, kills_y - 5)
@@ -2,14 +2,52 @@ import pygame
 import math
 import os
 from os.path import join
-from core import WINDOW_WIDTH, WINDOW_HEIGHT, load_settings, save_settings
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, load_settings, save_settings, assets, text_cache
+
+
+class CachedScreen:
+    """Статичная часть экрана меню в готовой поверхности: перерисовываются только изменившиеся виджеты"""
+
+    def __init__(self):
+        self.background = None
+        self.key = None
+        self.states = {}
+
+    def invalidate(self):
+        """Следующий кадр перерисует экран целиком (экран был занят чем-то другим)"""
+        self.background = None
+
+    def render(self, surface, build, widgets, key=None):
+        """Возвращает прямоугольники, которые нужно передать в pygame.display.update"""
+        if self.background is None or key != self.key:
+            self.background = pygame.Surface(surface.get_size())
+            self.key = key
+            build(self.background)
+            surface.blit(self.background, (0, 0))
+            self.states = {}
+            for widget in widgets:
+                widget.draw(surface)
+                self.states[widget] = widget.render_state()
+            return [surface.get_rect()]
+
+        rects = []
+        for widget in widgets:
+            state = widget.render_state()
+            if self.states.get(widget) != state:
+                # Под виджетом восстанавливается фон из кэша
+                area = widget.dirty_rect()
+                surface.blit(self.background, area, area)
+                widget.draw(surface)
+                self.states[widget] = state
+                rects.append(area)
+        return rects
 
 
 class Button:
     def __init__(self, x, y, width, height, text, font_size=36):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
         # Новые цвета в стиле вампирской темы
         self.color = (80, 0, 0)  # Тёмно-красный
         self.hover_color = (150, 0, 0)  # Красный при наведении
@@ -32,10 +70,17 @@ class Button:
         pygame.draw.rect(surface, self.border_color, self.rect, 2)
         
         # Рисуем текст
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = text_cache.render(self.text, self.font_size, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
+    def render_state(self):
+        return self.is_hovered, self.color, self.text
+
+    def dirty_rect(self):
+        # Вместе с тенью
+        return self.rect.union(self.rect.move(2, 2))
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
             self.is_hovered = self.rect.collidepoint(event.pos)
@@ -71,6 +116,13 @@ class Slider:
         pygame.draw.circle(surface, (150, 0, 0), 
                          (int(self.handle_pos), self.rect.centery), 
                          self.handle_radius)
+
+    def render_state(self):
+        return int(self.handle_pos)
+
+    def dirty_rect(self):
+        # Ползунок выступает за края линии на радиус
+        return self.rect.inflate(self.handle_radius * 2 + 2, 2)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -98,19 +150,35 @@ class Slider:
 class BaseMenu:
     def __init__(self):
         self.buttons = []
-        self.font = pygame.font.Font(None, 64)  # Увеличенный размер шрифта для заголовка
+        self.font_size = 64  # Увеличенный размер шрифта для заголовка
         self.title = ""
         self.background_color = (30, 0, 0)  # Тёмно-бордовый фон
         
         # Загружаем фоновое изображение для меню
         try:
-            self.background_image = pygame.image.load(join('..', 'images', 'ui', 'menu_bg.jpg')).convert()
-            # Масштабируем изображение под размер окна
-            self.background_image = pygame.transform.scale(self.background_image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+            # Масштабированный фон общий для всех меню
+            self.background_image = assets.scaled(join('..', 'images', 'ui', 'menu_bg.jpg'),
+                                                  (WINDOW_WIDTH, WINDOW_HEIGHT), alpha=False)
         except:
             self.background_image = None
-        
+
+        self.screen = CachedScreen()
+
+    def widgets(self):
+        """Элементы, которые меняются от наведения и перетаскивания"""
+        return self.buttons
+
+    def render(self, surface):
+        """Кадр меню: целиком только в первый раз, потом - изменившиеся виджеты"""
+        return self.screen.render(surface, self.build, self.widgets())
+
     def draw(self, surface):
+        self.build(surface)
+        for widget in self.widgets():
+            widget.draw(surface)
+
+    def build(self, surface):
+        """Статичная часть меню: фон и заголовок"""
         # Отрисовка фона
         if self.background_image:
             surface.blit(self.background_image, (0, 0))
@@ -123,17 +191,14 @@ class BaseMenu:
             
         if self.title:
             # Тень для заголовка (белая)
-            title_shadow = self.font.render(self.title, True, (255, 255, 255))
+            title_shadow = text_cache.render(self.title, self.font_size, (255, 255, 255))
             shadow_rect = title_shadow.get_rect(centerx=WINDOW_WIDTH // 2 + 2, y=52)
             surface.blit(title_shadow, shadow_rect)
             
             # Заголовок
-            title_surf = self.font.render(self.title, True, (200, 0, 0))
+            title_surf = text_cache.render(self.title, self.font_size, (200, 0, 0))
             title_rect = title_surf.get_rect(centerx=WINDOW_WIDTH // 2, y=50)
             surface.blit(title_surf, title_rect)
-            
-        for button in self.buttons:
-            button.draw(surface)
 
     def handle_event(self, event):
         for button in self.buttons:
@@ -162,15 +227,33 @@ class PauseMenu(BaseMenu):
             Button(center_x, 300, 200, 50, "Настройки"),
             Button(center_x, 400, 200, 50, "В меню")
         ]
+        # Застывший кадр игры - рисуется под меню вместо фона
+        self.snapshot = None
+
+    def set_snapshot(self, snapshot):
+        self.snapshot = snapshot
+        self.screen.invalidate()
+
+    def build(self, surface):
+        if self.snapshot is None:
+            super().build(surface)
+            return
+        background_image = self.background_image
+        self.background_image = self.snapshot
+        super().build(surface)
+        self.background_image = background_image
 
 class GameOverMenu:
     def __init__(self):
-        self.font = pygame.font.Font(None, 36)
-        self.title_font = pygame.font.Font(None, 72)
+        self.font_size = 36
+        self.title_font_size = 72
         self.buttons = [
             Button(WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 + 50, 200, 50, "заново"),
             Button(WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 + 100, 200, 50, "в меню")
         ]
+        self.screen = CachedScreen()
+        self.survival_time = 0
+        self.kills = 0
 
     def format_time(self, seconds):
         """Форматирует время в MM:SS"""
@@ -178,9 +261,25 @@ class GameOverMenu:
         seconds = seconds % 60
         return f"{minutes:02d}:{seconds:02d}"
 
+    def render(self, surface, survival_time=0, kills=0):
+        """Результаты меняются только между матчами - экран собирается один раз"""
+        self.survival_time = survival_time
+        self.kills = kills
+        return self.screen.render(surface, self.build, self.buttons, (survival_time, kills))
+
     def draw(self, surface, survival_time=0, kills=0):
+        self.survival_time = survival_time
+        self.kills = kills
+        self.build(surface)
+        for button in self.buttons:
+            button.draw(surface)
+
+    def build(self, surface):
+        survival_time, kills = self.survival_time, self.kills
+        surface.fill('black')
+
         # Заголовок
-        title_surf = self.title_font.render('GAME OVER', True, (255, 0, 0))
+        title_surf = text_cache.render('GAME OVER', self.title_font_size, (255, 0, 0))
         title_rect = title_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 3))
         surface.blit(title_surf, title_rect)
 
@@ -188,8 +287,8 @@ class GameOverMenu:
         time_text = f"Время выживания: {self.format_time(survival_time)}"
         kills_text = f"Убито врагов: {kills}"
 
-        time_surf = self.font.render(time_text, True, (255, 255, 255))
-        kills_surf = self.font.render(kills_text, True, (255, 255, 255))
+        time_surf = text_cache.render(time_text, self.font_size, (255, 255, 255))
+        kills_surf = text_cache.render(kills_text, self.font_size, (255, 255, 255))
 
         time_rect = time_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
         kills_rect = kills_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 20))
@@ -204,10 +303,6 @@ class GameOverMenu:
         surface.blit(time_surf, time_rect)
         surface.blit(kills_surf, kills_rect)
 
-        # Кнопки
-        for button in self.buttons:
-            button.draw(surface)
-
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mouse_pos = pygame.mouse.get_pos()
@@ -229,27 +324,26 @@ class SettingsMenu(BaseMenu):
         self.music_slider = Slider(center_x, 200, 300, 20, initial_val=music_volume)
         self.sound_slider = Slider(center_x, 300, 300, 20, initial_val=sound_volume)
         
-        # Создаем текст для слайдеров
-        self.font = pygame.font.Font(None, 36)
+        # Размер текста для слайдеров (им же рисуется заголовок)
+        self.font_size = 36
         
         self.buttons = [
             Button(center_x, 400, 200, 50, "Назад")
         ]
         
-    def draw(self, surface):
-        super().draw(surface)
+    def widgets(self):
+        return self.buttons + [self.music_slider, self.sound_slider]
+
+    def build(self, surface):
+        super().build(surface)
         
         # Рисуем текст для слайдеров
-        music_text = self.font.render("Громкость музыки", True, (200, 200, 200))
-        sound_text = self.font.render("Громкость эффектов", True, (200, 200, 200))
+        music_text = text_cache.render("Громкость музыки", self.font_size, (200, 200, 200))
+        sound_text = text_cache.render("Громкость эффектов", self.font_size, (200, 200, 200))
         
         surface.blit(music_text, (self.music_slider.rect.x, self.music_slider.rect.y - 30))
         surface.blit(sound_text, (self.sound_slider.rect.x, self.sound_slider.rect.y - 30))
         
-        # Рисуем слайдеры
-        self.music_slider.draw(surface)
-        self.sound_slider.draw(surface)
-        
     def handle_event(self, event):
         # Обрабатываем события слайдеров
         if self.music_slider.handle_event(event):
@@ -307,14 +401,10 @@ class GameParamsMenu(BaseMenu):
             map1_path = os.path.join(base_path, 'images', 'maps', 'map2_preview.png')
             
             if os.path.exists(map1_path) and os.path.exists(map2_path):
-                # Загружаем и масштабируем изображения
-                map1 = pygame.image.load(map1_path).convert_alpha()
-                map2 = pygame.image.load(map2_path).convert_alpha()
-                
-                # Масштабируем изображения до размера превью
+                # Загружаем изображения сразу в размере превью
                 self.map_images = [
-                    pygame.transform.scale(map1, (map_preview_size, map_preview_size)),
-                    pygame.transform.scale(map2, (map_preview_size, map_preview_size))
+                    assets.scaled(map1_path, (map_preview_size, map_preview_size)),
+                    assets.scaled(map2_path, (map_preview_size, map_preview_size))
                 ]
             else:
                 raise FileNotFoundError("Файлы превью не найдены")
@@ -330,16 +420,21 @@ class GameParamsMenu(BaseMenu):
         
         # Инициализация завершена
         
-    def draw(self, surface):
-        super().draw(surface)
-        
-        # Отрисовка кнопок сложности
+    def widgets(self):
+        # Выбранная сложность - это цвет кнопки, он входит в её состояние
         for i, button in enumerate(self.difficulty_buttons):
             if i == self.selected_difficulty:
                 button.color = (150, 0, 0)  # Выделяем выбранную сложность
             else:
                 button.color = (80, 0, 0)
-            button.draw(surface)
+        return self.difficulty_buttons + [self.play_button]
+
+    def render(self, surface):
+        # Смена карты перерисовывает экран целиком - это бывает только по клику
+        return self.screen.render(surface, self.build, self.widgets(), self.selected_map)
+
+    def build(self, surface):
+        super().build(surface)
             
         # Отрисовка превью карт
         for i, rect in enumerate(self.map_previews):
@@ -354,9 +449,6 @@ class GameParamsMenu(BaseMenu):
                 # Серая рамка для невыбранной карты
                 pygame.draw.rect(surface, (80, 80, 80), rect, 2)
         
-        # Отрисовка кнопки "Играть"
-        self.play_button.draw(surface)
-        
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mouse_pos = pygame.mouse.get_pos()
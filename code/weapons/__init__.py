@@ -5,6 +5,7 @@ from .sword import Sword
 from .auto_rifle import AutoRifle
 from .gun_sprite import GunSprite
 from .bullet import Bullet
+from .bullet_pool import BulletPool
 from .weapon_item import WeaponItem
 
-__all__ = ['Weapon', 'Pistol', 'Shotgun', 'Sword', 'AutoRifle', 'GunSprite', 'Bullet', 'WeaponItem'] 
\ No newline at end of file
+__all__ = ['Weapon', 'Pistol', 'Shotgun', 'Sword', 'AutoRifle', 'GunSprite', 'Bullet', 'BulletPool', 'WeaponItem'] 
\ No newline at end of file
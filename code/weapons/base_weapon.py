@@ -2,7 +2,9 @@ from os.path import join
 
 import pygame
 
+from core import assets, game_clock
 from .bullet import Bullet
+from .bullet_pool import BulletPool
 
 class Weapon:
     def __init__(self, player, groups):
@@ -10,13 +12,13 @@ class Weapon:
         self.all_sprites = groups['all']
         self.bullet_sprites = groups['bullet']
         self.can_shoot = True
-        self.shoot_time = 0
+        self.cooldown = 0
         self.player_direction = pygame.math.Vector2()
         self.rect = pygame.Rect(0, 0, 32, 32)
-        self.bullet_surf = pygame.image.load(join('..', 'images', 'gun', 'bullet.png')).convert_alpha()
-        self.shoot_sound = pygame.mixer.Sound(join('..', 'audio', 'shoot.wav'))
-        self.shoot_sound.set_volume(0.2)
-        self.weapon_surf = pygame.image.load(join('..', 'images', 'gun', 'pistol.png')).convert_alpha()
+        # Ресурсы общие для всех экземпляров оружия
+        self.bullet_surf = assets.image(join('..', 'images', 'gun', 'bullet.png'))
+        self.shoot_sound = assets.sound(join('..', 'audio', 'shoot.wav'), volume=0.2)
+        self.weapon_surf = assets.image(join('..', 'images', 'gun', 'pistol.png'))
         self.damage = 30
         self.bullet_spawn_distance = 30
 
@@ -25,17 +27,22 @@ class Weapon:
             self.shoot_sound.play()
             self._create_bullets()
             self.can_shoot = False
-            self.shoot_time = pygame.time.get_ticks()
+            # Перезарядку отсчитывает часы игры - опрашивать её каждый кадр не нужно
+            game_clock.schedule(self.cooldown, self.reload)
+
+    def reload(self):
+        self.can_shoot = True
 
     def _create_bullets(self):
         pass
 
+    def spawn_bullet(self, pos, direction):
+        # С пулом пуль оружие только ставит выстрел в очередь, иначе создаётся спрайт
+        if isinstance(self.bullet_sprites, BulletPool):
+            self.bullet_sprites.spawn(pos, direction)
+        else:
+            Bullet(self.bullet_surf, pos, direction, (self.all_sprites, self.bullet_sprites))
+
     def update_position(self, player_pos, direction):
         self.player_direction = direction
         self.rect.center = player_pos + direction * self.bullet_spawn_distance
-
-    def update_timer(self, cooldown):
-        if not self.can_shoot:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.shoot_time >= cooldown:
-                self.can_shoot = True 
\ No newline at end of file
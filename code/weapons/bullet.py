@@ -1,13 +1,18 @@
 import pygame
 
+from core import masks, Circle, game_clock
+
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, surf, pos, direction, groups):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_frect(center=pos)
-        self.mask = pygame.mask.from_surface(self.image)
-        self.spawn_time = pygame.time.get_ticks()
+        self.mask = masks.from_surface(self.image)
+        # Пуля для попаданий считается кругом
+        width, height = self.image.get_size()
+        self.shape = Circle(min(width, height) / 2, (width / 2, height / 2))
         self.lifetime = 1000
+        game_clock.schedule(self.lifetime, self.kill)
 
         self.direction = direction
         self.speed = 1200
@@ -19,8 +24,4 @@ class Bullet(pygame.sprite.Sprite):
         # Проверяем расстояние от начальной позиции
         current_pos = pygame.Vector2(self.rect.center)
         if (current_pos - self.original_pos).length() > 1000:  # Максимальная дистанция полета
-            self.kill()
-            return
-
-        if pygame.time.get_ticks() - self.spawn_time >= self.lifetime:
             self.kill() 
\ No newline at end of file
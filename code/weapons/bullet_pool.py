@@ -0,0 +1,123 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy пули остаются обычными спрайтами Bullet
+    np = None
+
+from core import masks, Circle, game_clock
+
+
+class BulletProbe:
+    """Переиспользуемое представление одной пули для проверки попаданий"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.index = -1
+        width, height = pool.image.get_size()
+        self.image = pool.image
+        self.rect = pygame.FRect(0, 0, width, height)
+        self.mask = masks.from_surface(self.image)
+        self.shape = Circle(min(width, height) / 2, (width / 2, height / 2))
+
+    def kill(self):
+        self.pool.kill(self.index)
+
+
+class BulletPool:
+    """Все живые пули в заранее выделенных массивах со списком свободных слотов"""
+    available = np is not None
+
+    def __init__(self, image, capacity=128, speed=1200, lifetime=1000, max_distance=1000):
+        self.image = image
+        self.half_size = np.array(image.get_size(), dtype=float) / 2
+        self.speed = speed
+        self.lifetime = lifetime
+        self.max_distance = max_distance
+
+        self.capacity = 0
+        self.pos = np.zeros((0, 2))
+        self.previous = np.zeros((0, 2))
+        self.direction = np.zeros((0, 2))
+        self.origin = np.zeros((0, 2))
+        self.spawn_time = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self.free_slots = []
+        self.grow(capacity)
+
+        self.probe = BulletProbe(self)
+
+    def grow(self, capacity):
+        def extend(array, shape):
+            new = np.zeros(shape, dtype=array.dtype)
+            new[:len(array)] = array
+            return new
+
+        self.pos = extend(self.pos, (capacity, 2))
+        self.previous = extend(self.previous, (capacity, 2))
+        self.direction = extend(self.direction, (capacity, 2))
+        self.origin = extend(self.origin, (capacity, 2))
+        self.spawn_time = extend(self.spawn_time, capacity)
+        self.alive = extend(self.alive, capacity)
+        # Новые слоты в обратном порядке, чтобы занимались с меньших индексов
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def spawn(self, pos, direction):
+        """Оружие только ставит пулю в очередь - никаких новых объектов"""
+        if not self.free_slots:
+            free_slots = self.free_slots
+            self.free_slots = []
+            self.grow(self.capacity * 2)
+            self.free_slots.extend(free_slots)
+        i = self.free_slots.pop()
+        self.pos[i] = pos[0], pos[1]
+        self.previous[i] = pos[0], pos[1]
+        self.origin[i] = pos[0], pos[1]
+        self.direction[i] = direction[0], direction[1]
+        self.spawn_time[i] = game_clock.ticks()
+        self.alive[i] = True
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.free_slots.append(i)
+
+    def begin_step(self):
+        self.previous[:] = self.pos
+
+    def update(self, dt):
+        """Движение и исчезновение всех пуль одной векторной операцией"""
+        live = np.nonzero(self.alive)[0]
+        if not len(live):
+            return
+        self.pos[live] += self.direction[live] * (self.speed * dt)
+        travelled = self.pos[live] - self.origin[live]
+        expired = (((travelled ** 2).sum(axis=1) > self.max_distance ** 2) |
+                   (game_clock.ticks() - self.spawn_time[live] >= self.lifetime))
+        for i in live[expired]:
+            self.kill(int(i))
+
+    def __len__(self):
+        return self.capacity - len(self.free_slots)
+
+    def sprites(self):
+        """Живые пули по одной через общий BulletProbe (для проверки попаданий)"""
+        probe = self.probe
+        for i in np.nonzero(self.alive)[0]:
+            if self.alive[i]:
+                probe.index = int(i)
+                probe.rect.center = self.pos[i]
+                yield probe
+
+    def draw(self, surface, offset, view_rect, alpha=1.0):
+        """Все видимые пули одним пакетом blits"""
+        live = np.nonzero(self.alive)[0]
+        if not len(live):
+            return
+        pos = self.previous[live] + (self.pos[live] - self.previous[live]) * alpha
+        half_width, half_height = self.half_size
+        visible = ((pos[:, 0] >= view_rect.left - half_width) & (pos[:, 0] <= view_rect.right + half_width) &
+                   (pos[:, 1] >= view_rect.top - half_height) & (pos[:, 1] <= view_rect.bottom + half_height))
+        topleft = pos[visible] - self.half_size + (offset.x, offset.y)
+        surface.blits([(self.image, (x, y)) for x, y in topleft.tolist()], False)
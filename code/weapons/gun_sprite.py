@@ -2,7 +2,7 @@ from math import atan2, degrees, sin, radians
 
 import pygame
 
-from core import WINDOW_WIDTH, WINDOW_HEIGHT
+from core import WINDOW_WIDTH, WINDOW_HEIGHT, inputs
 
 
 class GunSprite(pygame.sprite.Sprite):
@@ -29,7 +29,7 @@ class GunSprite(pygame.sprite.Sprite):
         self.rect = self.image.get_frect(center=self.player.rect.center + self.player_direction * self.distance)
 
     def get_direction(self):
-        mouse_pos = pygame.Vector2(pygame.mouse.get_pos())
+        mouse_pos = pygame.Vector2(inputs.frame.mouse_pos)
         player_pos = pygame.Vector2(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)
         raw_direction = mouse_pos - player_pos
 
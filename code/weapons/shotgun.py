@@ -3,8 +3,8 @@ from math import radians, cos, sin
 
 import pygame
 
+from core import assets
 from .base_weapon import Weapon
-from .bullet import Bullet
 
 
 class Shotgun(Weapon):
@@ -12,8 +12,7 @@ class Shotgun(Weapon):
         super().__init__(player, groups)
         self.cooldown = 500
         self.spread = 30
-        self.weapon_surf = pygame.image.load(join('..', 'images', 'gun', 'shotgun.png')).convert_alpha()
-        self.weapon_surf = pygame.transform.rotozoom(self.weapon_surf, 0, 1.2)
+        self.weapon_surf = assets.zoomed(join('..', 'images', 'gun', 'shotgun.png'), 1.2)
         self.damage = 30
 
     def _create_bullets(self):
@@ -24,4 +23,4 @@ class Shotgun(Weapon):
             angle = base_angle + angle_offset
             rad = radians(angle)
             direction = pygame.math.Vector2(cos(rad), sin(rad))
-            Bullet(self.bullet_surf, base_pos, direction, (self.all_sprites, self.bullet_sprites)) 
\ No newline at end of file
+            self.spawn_bullet(base_pos, direction) 
\ No newline at end of file
@@ -3,6 +3,7 @@ from math import radians, cos, sin
 
 import pygame
 
+from core import assets, sector_hits, game_clock
 from .base_weapon import Weapon
 
 
@@ -10,7 +11,7 @@ class Sword(Weapon):
     def __init__(self, player, groups):
         super().__init__(player, groups)
         self.cooldown = 400
-        self.weapon_surf = pygame.image.load(join('..', 'images', 'gun', 'sword.png')).convert_alpha()
+        self.weapon_surf = assets.image(join('..', 'images', 'gun', 'sword.png'))
         self.damage = 100
         self.attack_range = 100
         self.attack_angle = 60
@@ -26,7 +27,7 @@ class Sword(Weapon):
             # print("Not attacking, returning")  # Отладка
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.ticks()
         animation_progress = (current_time - self.attack_start_time) / self.attack_animation_duration
         # print(f"Animation progress: {animation_progress}")  # Отладка
         
@@ -93,30 +94,25 @@ class Sword(Weapon):
         # print(f"Creating bullets, is_attacking: {self.is_attacking}")  # Отладка
         if not self.is_attacking:
             self.is_attacking = True
-            self.attack_start_time = pygame.time.get_ticks()
+            self.attack_start_time = game_clock.ticks()
+            game_clock.schedule(self.attack_duration, self.end_attack)
             # print(f"Set is_attacking to True, start_time: {self.attack_start_time}")  # Отладка
             
-            attack_rect = pygame.Rect(0, 0, self.attack_range, self.attack_range)
-            player_center = pygame.math.Vector2(self.player.rect.center)
-            attack_rect.center = player_center + self.player_direction * (self.attack_range / 2)
-            
+            # Сектор удара проверяется аналитически по форме врага
+            player_center = self.player.rect.center
             for enemy in self.player.enemy_sprites:
-                if attack_rect.colliderect(enemy.rect):
-                    enemy_dir = pygame.math.Vector2(enemy.rect.center) - player_center
-                    angle = self.player_direction.angle_to(enemy_dir)
-                    if abs(angle) <= self.attack_angle / 2:
-                        enemy.take_damage(self.damage)
+                if sector_hits(player_center, self.player_direction, self.attack_range,
+                               self.attack_angle / 2, enemy):
+                    enemy.take_damage(self.damage)
 
-    def update_timer(self, cooldown):
-        current_time = pygame.time.get_ticks()
-        
-        if self.is_attacking and current_time - self.attack_start_time >= self.attack_duration:
-            # print(f"Resetting is_attacking, duration: {self.attack_duration}, time passed: {current_time - self.attack_start_time}")  # Отладка
-            self.is_attacking = False
-            
-        if not self.can_shoot:
-            if current_time - self.shoot_time >= cooldown:
-                self.can_shoot = True
+            # Рой врагов получает удар одной векторной операцией
+            swarm = getattr(getattr(self.player, 'game', None), 'swarm', None)
+            if swarm:
+                swarm.sector_damage(player_center, self.player_direction, self.attack_range,
+                                    self.attack_angle / 2, self.damage)
+
+    def end_attack(self):
+        self.is_attacking = False
 
     def update_position(self, pos, direction):
         self.player_direction = direction
@@ -1,6 +1,8 @@
 import pygame
 from math import sin
 
+from core import game_clock
+
 class WeaponItem(pygame.sprite.Sprite):
     def __init__(self, weapon_type, pos, groups):
         super().__init__(groups)
@@ -31,23 +33,16 @@ class WeaponItem(pygame.sprite.Sprite):
         pygame.draw.circle(self.pickup_glow_surface, self.pickup_glow_color, 
                          (self.pickup_radius, self.pickup_radius), self.pickup_radius)
         
-        # Эффект броска
-        self.throw_cooldown = 500  # Время в миллисекундах, в течение которого нельзя подобрать оружие
-        self.throw_time = pygame.time.get_ticks()
-        
         # Время жизни оружия на земле
         self.lifetime = 20000  # 20 секунд в миллисекундах
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.ticks()
+        self.expire_timer = game_clock.schedule(self.lifetime, self.expire)
+
+    def expire(self):
+        print(f"[DEBUG] WeaponItem {self.weapon_type.__class__.__name__} disappeared after {self.lifetime/1000} seconds")
+        self.kill()
         
     def update(self, dt):
-        current_time = pygame.time.get_ticks()
-        
-        # Проверяем время жизни
-        if current_time - self.spawn_time >= self.lifetime:
-            print(f"[DEBUG] WeaponItem {self.weapon_type.__class__.__name__} disappeared after {self.lifetime/1000} seconds")
-            self.kill()
-            return
-        
         # Обновляем эффект парения
         self.time += dt * self.float_speed
         self.float_offset = sin(self.time) * 10
@@ -70,13 +65,14 @@ class WeaponItem(pygame.sprite.Sprite):
                             # Передаем само оружие, а не его тип
                             if sprite.pickup_weapon(self.weapon_type):
                                 print(f"[DEBUG] Weapon pickup successful")
+                                self.expire_timer.cancel()  # Подобранное оружие не исчезает по таймеру
                                 self.kill()  # Удаляем предмет с карты
                             else:
                                 print(f"[DEBUG] Weapon pickup failed")
                             break
     
     def draw_effects(self, surface, offset):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.ticks()
         
         # Получаем позицию на экране с учетом смещения камеры
         screen_rect = self.rect.copy()
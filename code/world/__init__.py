@@ -0,0 +1,4 @@
+from .map_cache import MapData, load_map, compile_map
+from .navigation import FlowField
+
+__all__ = ['MapData', 'load_map', 'compile_map', 'FlowField']
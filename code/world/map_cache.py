@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+import zlib
+import xml.etree.ElementTree as ElementTree
+from array import array
+
+import pygame
+
+# Версия формата кэша - при изменении формата старые файлы просто пересобираются
+CACHE_VERSION = 1
+CACHE_DIR = '.cache'
+ATLAS_WIDTH = 2048
+
+
+class MapData:
+    """Скомпилированная карта: всё, что нужно Game.setup, без разбора TMX"""
+
+    def __init__(self, width, height, tile_size, ground, objects, collisions, entities, images):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.ground = ground          # array('H') width*height, индекс в images (0 - пусто)
+        self.objects = objects        # [(x, y, индекс изображения)]
+        self.collisions = collisions  # [(x, y, width, height)]
+        self.entities = entities      # [(name, x, y)]
+        self.images = images          # [None, Surface, Surface, ...]
+
+    def ground_tiles(self):
+        """Тайлы земли в том же виде, что и Layer.tiles() из pytmx"""
+        for y in range(self.height):
+            row = y * self.width
+            for x in range(self.width):
+                index = self.ground[row + x]
+                if index:
+                    yield x, y, self.images[index]
+
+    def object_images(self):
+        for x, y, index in self.objects:
+            yield x, y, self.images[index]
+
+
+def map_dependencies(tmx_path):
+    """TMX и все файлы, от которых он зависит (TSX и картинки тайлсетов)"""
+    paths = [tmx_path]
+    tmx_dir = os.path.dirname(tmx_path)
+    tmx_root = ElementTree.parse(tmx_path).getroot()
+    for tileset in tmx_root.iter('tileset'):
+        source = tileset.get('source')
+        if source:
+            tsx_path = os.path.normpath(os.path.join(tmx_dir, source))
+            paths.append(tsx_path)
+            tsx_dir = os.path.dirname(tsx_path)
+            for image in ElementTree.parse(tsx_path).getroot().iter('image'):
+                paths.append(os.path.normpath(os.path.join(tsx_dir, image.get('source'))))
+        else:
+            for image in tileset.iter('image'):
+                paths.append(os.path.normpath(os.path.join(tmx_dir, image.get('source'))))
+    return paths
+
+
+def map_fingerprint(tmx_path):
+    """Ключ кэша: хэш TMX/TSX и время изменения/размер картинок"""
+    digest = hashlib.sha1(str(CACHE_VERSION).encode())
+    for path in map_dependencies(tmx_path):
+        digest.update(path.encode())
+        if path.endswith(('.tmx', '.tsx')):
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha1(f.read()).digest())
+        else:
+            try:
+                stat = os.stat(path)
+                digest.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode())
+            except OSError:
+                digest.update(b'missing')
+    return digest.hexdigest()
+
+
+def cache_path(tmx_path):
+    folder, name = os.path.split(tmx_path)
+    return os.path.join(folder, CACHE_DIR, name + '.bin')
+
+
+def pack_atlas(images):
+    """Упаковка изображений полками в одну текстуру"""
+    placements = [None] * len(images)
+    order = sorted(range(len(images)), key=lambda i: images[i].get_height(), reverse=True)
+    x = y = shelf_height = 0
+    width = max([ATLAS_WIDTH] + [image.get_width() for image in images])
+    for i in order:
+        w, h = images[i].get_size()
+        if x + w > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        placements[i] = (x, y, w, h)
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    atlas = pygame.Surface((width, max(1, y + shelf_height)), pygame.SRCALPHA)
+    for image, (x, y, w, h) in zip(images, placements):
+        atlas.blit(image, (x, y))
+    return atlas, placements
+
+
+def compile_map(tmx_path):
+    """Разбирает TMX через pytmx и возвращает (MapData, данные для записи в кэш)"""
+    from pytmx.util_pygame import load_pygame
+
+    tmx_data = load_pygame(tmx_path)
+
+    # Уникальные изображения (pytmx переиспользует одну поверхность на gid)
+    image_index = {}
+    images = [None]
+
+    def register(surf):
+        key = id(surf)
+        if key not in image_index:
+            image_index[key] = len(images)
+            images.append(surf)
+        return image_index[key]
+
+    ground = array('H', bytes(2 * tmx_data.width * tmx_data.height))
+    for x, y, surf in tmx_data.get_layer_by_name('Ground').tiles():
+        ground[y * tmx_data.width + x] = register(surf)
+
+    objects = [(obj.x, obj.y, register(obj.image)) for obj in tmx_data.get_layer_by_name('Objects')]
+    collisions = [(obj.x, obj.y, obj.width, obj.height) for obj in tmx_data.get_layer_by_name('Collisions')]
+    entities = [(obj.name, obj.x, obj.y) for obj in tmx_data.get_layer_by_name('Entities')]
+
+    atlas, placements = pack_atlas(images[1:])
+    payload = {
+        'version': CACHE_VERSION,
+        'size': (tmx_data.width, tmx_data.height, tmx_data.tilewidth),
+        'ground': ground.tobytes(),
+        'objects': objects,
+        'collisions': collisions,
+        'entities': entities,
+        'atlas_size': atlas.get_size(),
+        'atlas': zlib.compress(pygame.image.tobytes(atlas, 'RGBA'), 1),
+        'placements': placements,
+    }
+    map_data = MapData(tmx_data.width, tmx_data.height, tmx_data.tilewidth,
+                       ground, objects, collisions, entities, images)
+    return map_data, payload
+
+
+def map_from_payload(payload):
+    width, height, tile_size = payload['size']
+    ground = array('H')
+    ground.frombytes(payload['ground'])
+    atlas = pygame.image.frombytes(zlib.decompress(payload['atlas']), payload['atlas_size'], 'RGBA').convert_alpha()
+    images = [None] + [atlas.subsurface(rect) for rect in payload['placements']]
+    return MapData(width, height, tile_size, ground, payload['objects'],
+                   payload['collisions'], payload['entities'], images)
+
+
+def load_map(tmx_path):
+    """Загружает карту из кэша, если он актуален, иначе компилирует TMX и обновляет кэш"""
+    fingerprint = map_fingerprint(tmx_path)
+    path = cache_path(tmx_path)
+
+    try:
+        with open(path, 'rb') as f:
+            stored_fingerprint, payload = pickle.loads(f.read())
+        if stored_fingerprint == fingerprint and payload.get('version') == CACHE_VERSION:
+            return map_from_payload(payload)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, KeyError):
+        pass
+
+    map_data, payload = compile_map(tmx_path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(pickle.dumps((fingerprint, payload), protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError as e:
+        print(f"Не удалось сохранить кэш карты: {e}")
+    return map_data
@@ -0,0 +1,121 @@
+from array import array
+from collections import deque
+from math import sqrt
+
+# Клетка считается непроходимой, если коллайдеры закрывают хотя бы такую её долю
+BLOCK_COVERAGE = 0.5
+
+DIAGONAL = sqrt(0.5)
+# Соседи для выбора направления: сначала прямые, потом диагональные
+NEIGHBOURS = (
+    (1, 0, 1.0, 0.0), (-1, 0, -1.0, 0.0), (0, 1, 0.0, 1.0), (0, -1, 0.0, -1.0),
+    (1, 1, DIAGONAL, DIAGONAL), (1, -1, DIAGONAL, -DIAGONAL),
+    (-1, 1, -DIAGONAL, DIAGONAL), (-1, -1, -DIAGONAL, -DIAGONAL),
+)
+
+
+class FlowField:
+    """Поле направлений к игроку по сетке тайлов: один BFS на всех врагов"""
+
+    def __init__(self, width, height, cell_size, blocked):
+        self.width = width            # размер сетки в клетках
+        self.height = height
+        self.cell_size = cell_size
+        self.blocked = blocked        # bytearray width*height, 1 - непроходимо
+        self.distance = array('i', [-1]) * (width * height)
+        self.directions = {}          # кэш направлений клеток для текущего BFS
+        self.target_cell = None
+
+    @classmethod
+    def from_rects(cls, rects, width, height, cell_size):
+        """Растеризует коллайдеры карты в сетку width x height клеток"""
+        coverage = [0.0] * (width * height)
+        for rect in rects:
+            x0 = max(0, int(rect.left // cell_size))
+            y0 = max(0, int(rect.top // cell_size))
+            x1 = min(width - 1, int((rect.right - 1) // cell_size))
+            y1 = min(height - 1, int((rect.bottom - 1) // cell_size))
+            for y in range(y0, y1 + 1):
+                top, bottom = y * cell_size, (y + 1) * cell_size
+                overlap_y = min(bottom, rect.bottom) - max(top, rect.top)
+                for x in range(x0, x1 + 1):
+                    left, right = x * cell_size, (x + 1) * cell_size
+                    overlap_x = min(right, rect.right) - max(left, rect.left)
+                    if overlap_x > 0 and overlap_y > 0:
+                        coverage[y * width + x] += overlap_x * overlap_y
+
+        limit = BLOCK_COVERAGE * cell_size * cell_size
+        blocked = bytearray(1 if area >= limit else 0 for area in coverage)
+        return cls(width, height, cell_size, blocked)
+
+    def cell_index(self, pos):
+        x = int(pos[0] // self.cell_size)
+        y = int(pos[1] // self.cell_size)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def update(self, target_pos):
+        """Пересчитывает поле, только если цель перешла в другую клетку"""
+        cell = self.cell_index(target_pos)
+        if cell is None or cell == self.target_cell:
+            return False
+        self.target_cell = cell
+        self.rebuild(cell)
+        return True
+
+    def rebuild(self, start):
+        """BFS по четырём направлениям от клетки цели"""
+        width = self.width
+        size = width * self.height
+        blocked = self.blocked
+        distance = array('i', [-1]) * size
+        distance[start] = 0
+        queue = deque((start,))
+        while queue:
+            index = queue.popleft()
+            step = distance[index] + 1
+            x = index % width
+            for neighbour in (index - 1 if x > 0 else -1,
+                              index + 1 if x < width - 1 else -1,
+                              index - width,
+                              index + width if index + width < size else -1):
+                if neighbour >= 0 and distance[neighbour] < 0 and not blocked[neighbour]:
+                    distance[neighbour] = step
+                    queue.append(neighbour)
+        self.distance = distance
+        self.directions = {}
+
+    def cell_direction(self, index):
+        """Единичное направление из клетки к соседу, ближайшему к цели (None - идти напрямую)"""
+        direction = self.directions.get(index, False)
+        if direction is not False:
+            return direction
+
+        direction = None
+        distance = self.distance
+        best = distance[index]
+        if best > 0:
+            width = self.width
+            x, y = index % width, index // width
+            for dx, dy, vx, vy in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < self.height):
+                    continue
+                value = distance[ny * width + nx]
+                if value < 0 or value >= best:
+                    continue
+                # По диагонали - только если обе прямые клетки проходимы (не срезаем углы)
+                if dx and dy and (distance[y * width + nx] < 0 or distance[ny * width + x] < 0):
+                    continue
+                best = value
+                direction = (vx, vy)
+        self.directions[index] = direction
+        return direction
+
+    def direction(self, pos):
+        """Направление движения для точки мира за O(1)"""
+        index = self.cell_index(pos)
+        if index is None:
+            return None
+        return self.cell_direction(index)